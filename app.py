@@ -4,10 +4,13 @@ import uuid
 
 from flask import Flask, jsonify, request, g
 from flask_session import Session
+from backend.modules.codec import start_background_backfill
+from backend.modules.summaries import start_background_summary_backfill
 from backend.routes.analysis_routes import analysis_bp
 from backend.routes.auth_routes import auth_bp
 from backend.routes.brand_routes import brand_bp
 from backend.routes.dashboard_routes import dashboard_bp
+from backend.routes.internal_routes import internal_bp
 
 app = Flask(__name__, static_folder="backend/static", static_url_path="/static")
 
@@ -34,6 +37,12 @@ app.register_blueprint(auth_bp)
 app.register_blueprint(brand_bp)
 app.register_blueprint(analysis_bp)
 app.register_blueprint(dashboard_bp)
+app.register_blueprint(internal_bp)
+
+# Compress report JSON written before the codec existed (JSON_CODEC_BACKFILL=0 to skip).
+start_background_backfill()
+# Summarize scans saved before scan_summaries existed (SCAN_SUMMARY_BACKFILL=0 to skip).
+start_background_summary_backfill()
 
 
 # Request ID middleware
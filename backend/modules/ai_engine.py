@@ -4,14 +4,21 @@ AnswerScope AI - AI Engine Module
 Handles ALL AI provider logic. No other file should call external AI services.
 """
 
+import copy
+import hashlib
 import json
 import os
 import re
+import threading
 
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
 
+from .cache import build_cache
+from .document import BOILERPLATE_PATTERN, BOILERPLATE_TAGS, parse_document
 from .logger import get_logger
 
 try:
@@ -21,6 +28,7 @@ except Exception:  # pragma: no cover - optional dependency at runtime
 
 try:
     from readability import Document
+    from readability.readability import html_cleaner as readability_cleaner
 except Exception:  # pragma: no cover - optional dependency at runtime
     Document = None
 
@@ -31,6 +39,19 @@ logger = get_logger(__name__)
 AI_PROVIDER = "GEMINI"
 DEV_MODE = False
 MAX_CLEAN_TEXT_CHARS = int(os.environ.get("LLM_CLEAN_TEXT_MAX_CHARS", "18000"))
+# Bump whenever the analysis prompt or normalization contract changes; it is part of the
+# LLM cache key so stale payloads are never served after a template change.
+PROMPT_TEMPLATE_VERSION = "geo-audit-v1"
+
+# Opt-in: ask the SDK for JSON constrained to REPORT_RESPONSE_SCHEMA instead of free text.
+STRUCTURED_OUTPUT = os.environ.get("GEMINI_STRUCTURED_OUTPUT", "").lower() in ("1", "true", "yes")
+
+LLM_CACHE = build_cache(
+    "llm_analysis",
+    backend=os.environ.get("LLM_CACHE_BACKEND", "memory"),
+    max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=float(os.environ.get("LLM_CACHE_TTL_SEC", "86400")),
+)
 
 SCORE_WEIGHTS = {
     "visibility": 40,
@@ -39,10 +60,6 @@ SCORE_WEIGHTS = {
     "visual": 10,
 }
 
-BOILERPLATE_PATTERN = re.compile(
-    r"menu|nav|breadcrumb|footer|header|sidebar|cookie|banner",
-    re.IGNORECASE,
-)
 NAV_TEXT_PATTERN = re.compile(
     r"home|menu|sign in|login|cart|wishlist|cookie|privacy|terms",
     re.IGNORECASE,
@@ -50,6 +67,125 @@ NAV_TEXT_PATTERN = re.compile(
 BANNED_OUTPUT_TERMS = re.compile(r"\b(mock data|mock|simulation|dummy)\b", re.IGNORECASE)
 
 
+def _string_list_schema():
+    return {"type": "ARRAY", "items": {"type": "STRING"}}
+
+
+# Mirrors the JSON contract spelled out in the analysis prompt (OpenAPI subset used by the SDK).
+REPORT_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "scores": {
+            "type": "OBJECT",
+            "properties": {
+                "visibility": {"type": "INTEGER"},
+                "content": {"type": "INTEGER"},
+                "technical": {"type": "INTEGER"},
+                "visual": {"type": "INTEGER"},
+            },
+            "required": ["visibility", "content", "technical", "visual"],
+        },
+        "sentiment": {
+            "type": "OBJECT",
+            "properties": {
+                "label": {"type": "STRING", "enum": ["Positive", "Neutral", "Negative"]},
+                "score": {"type": "INTEGER"},
+            },
+            "required": ["label", "score"],
+        },
+        "market_intel": {
+            "type": "OBJECT",
+            "properties": {
+                "top_competitor_found": {"type": "STRING"},
+                "why_they_won": {"type": "STRING"},
+                "competitor_threat_level": {"type": "STRING", "enum": ["Low", "Medium", "High"]},
+            },
+            "required": ["top_competitor_found", "why_they_won", "competitor_threat_level"],
+        },
+        "gap_analysis": {
+            "type": "OBJECT",
+            "properties": {
+                "missing_keywords": _string_list_schema(),
+                "content_gaps": _string_list_schema(),
+            },
+            "required": ["missing_keywords", "content_gaps"],
+        },
+        "technical_audit": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "check": {"type": "STRING"},
+                    "status": {"type": "STRING", "enum": ["pass", "warn", "fail"]},
+                    "evidence": {"type": "STRING"},
+                },
+                "required": ["check", "status", "evidence"],
+            },
+        },
+        "action_plan": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "priority": {"type": "STRING", "enum": ["High", "Medium", "Low"]},
+                    "owner_hint": {"type": "STRING"},
+                    "title": {"type": "STRING"},
+                    "step_by_step": _string_list_schema(),
+                    "success_metric": {"type": "STRING"},
+                    "why_this_matters": {"type": "STRING"},
+                    "evidence_reference": {"type": "STRING"},
+                    "eta_days": {"type": "INTEGER"},
+                },
+                "required": ["priority", "title", "step_by_step"],
+            },
+        },
+        "recommended_playbook": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "title": {"type": "STRING"},
+                    "owner_hint": {"type": "STRING"},
+                    "reason": {"type": "STRING"},
+                },
+            },
+        },
+        "executive_summary": _string_list_schema(),
+        "diagnostics": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "finding": {"type": "STRING"},
+                    "evidence": {"type": "STRING"},
+                },
+                "required": ["finding"],
+            },
+        },
+        "what_is_working": _string_list_schema(),
+        "what_is_missing": _string_list_schema(),
+        "competitor_analysis": {
+            "type": "OBJECT",
+            "properties": {
+                "wins": _string_list_schema(),
+                "losses": _string_list_schema(),
+            },
+        },
+        "keyword_gaps": _string_list_schema(),
+    },
+    "required": [
+        "scores",
+        "sentiment",
+        "market_intel",
+        "gap_analysis",
+        "technical_audit",
+        "action_plan",
+        "executive_summary",
+        "diagnostics",
+    ],
+}
+
+
 def _clamp_int(value, default=0, lower=0, upper=100):
     try:
         return max(lower, min(upper, int(round(float(value)))))
@@ -509,19 +645,7 @@ def mock_response():
 
 
 def _remove_boilerplate_nodes(soup):
-    for element in soup(
-        [
-            "script",
-            "style",
-            "svg",
-            "footer",
-            "nav",
-            "noscript",
-            "header",
-            "aside",
-            "form",
-        ]
-    ):
+    for element in soup(list(BOILERPLATE_TAGS)):
         element.decompose()
 
     for element in soup.find_all(True):
@@ -532,12 +656,16 @@ def _remove_boilerplate_nodes(soup):
             element.decompose()
 
 
-def _extract_with_trafilatura(raw_html):
+def _extract_with_trafilatura(document):
     if not trafilatura:
         return None
+    # Hand trafilatura a copy of the already-parsed tree; it prunes in place.
+    tree = document.copy_tree()
+    if tree is None:
+        return None
     try:
         return trafilatura.extract(
-            raw_html,
+            tree,
             include_comments=False,
             include_tables=True,
             favor_precision=True,
@@ -548,11 +676,27 @@ def _extract_with_trafilatura(raw_html):
         return None
 
 
-def _extract_with_readability(raw_html):
-    if not Document:
+if Document is not None:
+
+    class _TreeReadabilityDocument(Document):
+        """readability-lxml Document built from the scan's parsed tree, not its HTML."""
+
+        def _parse(self, input):
+            # The cleaner works on a deep copy, so each summary() pass starts fresh
+            # and the shared tree is left untouched.
+            doc = readability_cleaner.clean_html(input)
+            doc.resolve_base_href(handle_failures=self.handle_failures)
+            return doc
+
+else:
+    _TreeReadabilityDocument = None
+
+
+def _extract_with_readability(document):
+    if not _TreeReadabilityDocument or document.tree is None:
         return None
     try:
-        summary_html = Document(raw_html).summary(html_partial=True)
+        summary_html = _TreeReadabilityDocument(document.tree).summary(html_partial=True)
         soup = BeautifulSoup(summary_html, "html.parser")
         _remove_boilerplate_nodes(soup)
         return soup.get_text(separator="\n", strip=True)
@@ -561,30 +705,14 @@ def _extract_with_readability(raw_html):
         return None
 
 
-def _extract_with_bs4(raw_html):
+def _extract_from_document(document):
     try:
-        soup = BeautifulSoup(raw_html, "html.parser")
-        _remove_boilerplate_nodes(soup)
-
-        blocks = []
-        if soup.title and soup.title.get_text(strip=True):
-            blocks.append(soup.title.get_text(" ", strip=True))
-
-        for tag in soup.find_all(["h1", "h2"]):
-            text = tag.get_text(" ", strip=True)
-            if text:
-                blocks.append(text)
-
-        for tag in soup.find_all(["p", "li"]):
-            text = tag.get_text(" ", strip=True)
-            if text and len(text) >= 30:
-                blocks.append(text)
-
+        blocks = document.text_blocks
         if not blocks:
-            return soup.get_text(separator="\n", strip=True)
+            return document.full_text(separator="\n")
         return "\n".join(blocks)
     except Exception:
-        logger.exception("BeautifulSoup extraction failed")
+        logger.exception("Document block extraction failed")
         return None
 
 
@@ -665,10 +793,11 @@ def _prioritize_sections(text, max_chars):
     return text_out[:max_chars]
 
 
-def clean_html_for_llm(raw_html):
+def clean_html_for_llm(raw_html, document=None):
     """
     Deterministic extraction pipeline:
-    trafilatura -> readability-lxml -> BeautifulSoup fallback.
+    trafilatura -> readability-lxml -> parsed-document block fallback.
+    `document` is the scan's ParsedDocument; it is built here when not supplied.
     Returns metadata for observability and downstream status APIs.
     """
     source_char_count = len(raw_html or "")
@@ -681,15 +810,17 @@ def clean_html_for_llm(raw_html):
         }
 
     # Prefer highest-fidelity extraction first; progressively degrade to preserve uptime.
-    extraction_method = "bs4_fallback"
+    if document is None:
+        document = parse_document(raw_html)
+    extraction_method = "document_fallback"
     extracted_text = None
 
     for method, extractor in (
         ("trafilatura", _extract_with_trafilatura),
         ("readability", _extract_with_readability),
-        ("bs4_fallback", _extract_with_bs4),
+        ("document_fallback", _extract_from_document),
     ):
-        candidate = extractor(raw_html)
+        candidate = extractor(document)
         if candidate and len(candidate.strip()) >= 150:
             extraction_method = method
             extracted_text = candidate
@@ -852,41 +983,312 @@ def _normalize_ai_payload(parsed, raw_text):
     return payload
 
 
-def gemini_analysis(prompt):
-    """
-    Calls Gemini API via Google GenAI SDK.
-    Returns strict dashboard-ready JSON and backward-compatible score keys.
-    """
+_client = None
+_client_api_key = None
+_client_lock = threading.Lock()
+
+
+def _gemini_settings():
     api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
     model = os.environ.get("AI_MODEL", "gemini-2.5-pro")
+    return api_key, model
+
+
+def get_gemini_client(api_key):
+    """
+    Return the process-wide GenAI client, created lazily and rebuilt only if the key changes.
+    """
+    global _client, _client_api_key
+    with _client_lock:
+        if _client is None or _client_api_key != api_key:
+            _client = genai.Client(api_key=api_key)
+            _client_api_key = api_key
+        return _client
+
+
+def _missing_key_output():
+    return _default_structured_output(
+        "Error: GEMINI_API_KEY/GOOGLE_API_KEY environment variable not set"
+    )
 
+
+def _structured_config():
+    return genai_types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=REPORT_RESPONSE_SCHEMA,
+    )
+
+
+def _normalize_gemini_response(response, structured=False):
+    """
+    Returns (payload, parsed_ok). Only parsed_ok payloads are safe to cache.
+    """
+    ai_content = getattr(response, "text", None) or str(response)
+    return _normalize_gemini_text(ai_content, structured=structured)
+
+
+def _normalize_gemini_text(ai_content, structured=False):
+    """
+    Structured responses are strict JSON and skip the repair path unless they fail to load.
+    """
+    parsed = None
+    if structured:
+        try:
+            parsed = json.loads(ai_content)
+        except Exception:
+            logger.warning("Structured Gemini output was not valid JSON; using repair path")
+        if not isinstance(parsed, dict):
+            parsed = None
+    if parsed is None:
+        parsed = _extract_json_payload(ai_content)
+    return _normalize_ai_payload(parsed, ai_content), isinstance(parsed, dict)
+
+
+def _run_gemini(prompt):
+    api_key, model = _gemini_settings()
     if not api_key:
-        return _default_structured_output(
-            "Error: GEMINI_API_KEY/GOOGLE_API_KEY environment variable not set"
-        )
+        return _missing_key_output(), False
 
     try:
-        client = genai.Client(api_key=api_key)
+        client = get_gemini_client(api_key)
+        if STRUCTURED_OUTPUT:
+            try:
+                response = client.models.generate_content(
+                    model=model,
+                    contents=prompt,
+                    config=_structured_config(),
+                )
+                return _normalize_gemini_response(response, structured=True)
+            except genai_errors.ClientError:
+                # Model/SDK rejected the schema request; retry once in free-text mode.
+                logger.exception("Gemini structured output request rejected")
         response = client.models.generate_content(
             model=model,
             contents=prompt,
         )
-        ai_content = getattr(response, "text", None) or str(response)
-        parsed = _extract_json_payload(ai_content)
-        return _normalize_ai_payload(parsed, ai_content)
+        return _normalize_gemini_response(response)
     except Exception:
         logger.exception("Gemini API Exception")
-        return _default_structured_output("API Error: Gemini request failed")
+        return _default_structured_output("API Error: Gemini request failed"), False
 
 
-def ai_analysis(ai_overview, website_html, brand_context=None):
+class _SectionStreamParser:
     """
-    Main AI analysis function.
-    Combines AI overview and website content, sends to provider.
+    Incrementally scans a streamed JSON object and reports top-level members as soon as
+    their values close, e.g. "scores" long before "action_plan" has finished.
+    Text before the first "{" (code fences, preamble) is ignored.
     """
-    if DEV_MODE:
-        return mock_response()
 
+    def __init__(self):
+        self.text = ""
+        self.sections = {}
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+        self._closed = False
+
+    def _emit(self, raw_value, completed):
+        raw_value = raw_value.strip()
+        for candidate in (raw_value, re.sub(r",\s*([}\]])", r"\1", raw_value)):
+            try:
+                self.sections[self._key] = json.loads(candidate)
+                completed.append(self._key)
+                break
+            except Exception:
+                continue
+        self._key = None
+        self._value_start = None
+
+    def feed(self, chunk):
+        """Consume a chunk; returns the keys of sections completed by it."""
+        self.text += chunk
+        completed = []
+        text = self.text
+        for idx in range(self._pos, len(text)):
+            if self._closed:
+                break
+            char = text[idx]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = text[self._key_start:idx]
+                        self._key_start = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None and self._value_start is None:
+                    self._key_start = idx + 1
+                continue
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+            if self._depth == 1:
+                if char == ":" and self._key is not None and self._value_start is None:
+                    self._value_start = idx + 1
+                    continue
+                if char in ",}":
+                    if self._key is not None and self._value_start is not None:
+                        self._emit(text[self._value_start:idx], completed)
+                    self._key = None
+                    self._value_start = None
+                    if char == "}":
+                        self._depth = 0
+                        self._closed = True
+                    continue
+            if char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._key is not None and self._value_start is not None:
+                    self._emit(text[self._value_start:idx + 1], completed)
+        self._pos = len(text)
+        return completed
+
+
+def _normalize_partial_sections(sections):
+    """
+    Dashboard-safe view of the sections completed so far in a streamed response.
+    """
+    partial = {}
+    scores = sections.get("scores")
+    if isinstance(scores, dict):
+        partial["scores"] = {key: _clamp_int(scores.get(key, 0)) for key in SCORE_WEIGHTS}
+    if "sentiment" in sections:
+        partial["sentiment"] = _normalize_sentiment(sections["sentiment"])
+    if "market_intel" in sections:
+        visibility = partial.get("scores", {}).get("visibility", 0)
+        partial["market_intel"] = _normalize_market_intel(sections["market_intel"], {}, visibility)
+    if "gap_analysis" in sections:
+        partial["gap_analysis"] = _normalize_gap_analysis(sections["gap_analysis"], {})
+    if "technical_audit" in sections:
+        partial["technical_audit"] = _normalize_technical_audit(sections["technical_audit"])
+    if "action_plan" in sections:
+        partial["action_plan"] = _normalize_action_plan(sections["action_plan"])
+    if "executive_summary" in sections:
+        partial["executive_summary"] = _normalize_executive_summary(sections["executive_summary"])
+    return partial
+
+
+def _notify_progress(progress_callback, update):
+    try:
+        progress_callback(update)
+    except Exception:
+        logger.exception("AI progress callback failed")
+
+
+def _stream_generate(client, model, prompt, config, progress_callback):
+    parser = _SectionStreamParser()
+    bytes_received = 0
+    chunks = 0
+    stream = client.models.generate_content_stream(model=model, contents=prompt, config=config)
+    for chunk in stream:
+        text = getattr(chunk, "text", None) or ""
+        if not text:
+            continue
+        chunks += 1
+        bytes_received += len(text.encode("utf-8"))
+        completed = parser.feed(text)
+        usage = getattr(chunk, "usage_metadata", None)
+        _notify_progress(
+            progress_callback,
+            {
+                "bytes_received": bytes_received,
+                "chunks": chunks,
+                "tokens_received": getattr(usage, "candidates_token_count", None),
+                "completed_sections": completed,
+                "partial": _normalize_partial_sections(parser.sections) if completed else None,
+            },
+        )
+    return parser.text
+
+
+def _run_gemini_stream(prompt, progress_callback):
+    """
+    Streaming variant of _run_gemini. Pushes byte/token progress and partially
+    parsed sections to `progress_callback` as the response arrives.
+    """
+    api_key, model = _gemini_settings()
+    if not api_key:
+        return _missing_key_output(), False
+
+    try:
+        client = get_gemini_client(api_key)
+        if STRUCTURED_OUTPUT:
+            try:
+                ai_content = _stream_generate(
+                    client, model, prompt, _structured_config(), progress_callback
+                )
+                return _normalize_gemini_text(ai_content, structured=True)
+            except genai_errors.ClientError:
+                logger.exception("Gemini structured output request rejected (stream)")
+        ai_content = _stream_generate(client, model, prompt, None, progress_callback)
+        return _normalize_gemini_text(ai_content)
+    except Exception:
+        logger.exception("Gemini API Exception (stream)")
+        return _default_structured_output("API Error: Gemini request failed"), False
+
+
+def gemini_analysis(prompt):
+    """
+    Calls Gemini API via Google GenAI SDK.
+    Returns strict dashboard-ready JSON and backward-compatible score keys.
+    """
+    return _run_gemini(prompt)[0]
+
+
+def _llm_cache_key(brand_fields, cleaned_site_text, ai_text, overview_meta):
+    _, model = _gemini_settings()
+    material = json.dumps(
+        {
+            "model": model,
+            "template": PROMPT_TEMPLATE_VERSION,
+            "structured": STRUCTURED_OUTPUT,
+            "brand": brand_fields,
+            "site": cleaned_site_text,
+            "overview": ai_text,
+            "overview_meta": overview_meta,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def llm_cache_stats():
+    return LLM_CACHE.stats() if LLM_CACHE is not None else None
+
+
+def _cached_analysis(cache_key, bypass_cache):
+    if LLM_CACHE is None or bypass_cache:
+        return None
+    cached = LLM_CACHE.get(cache_key)
+    if not isinstance(cached, dict):
+        return None
+    logger.info("LLM cache hit (%s)", cache_key[:12])
+    # Callers mutate the payload (e.g. charts), so never hand out the cached object.
+    return copy.deepcopy(cached)
+
+
+def _store_analysis(cache_key, payload, parsed_ok):
+    if LLM_CACHE is not None and parsed_ok:
+        LLM_CACHE.set(cache_key, copy.deepcopy(payload))
+
+
+def _build_analysis_request(ai_overview, website_html, brand_context=None, document=None):
+    """
+    Clean the page and build the provider prompt.
+    Returns (prompt, cleaned_payload, overview_meta, cache_key).
+    """
     brand_context = brand_context or {}
     if isinstance(ai_overview, dict):
         ai_text = ai_overview.get("text", "")
@@ -906,7 +1308,7 @@ def ai_analysis(ai_overview, website_html, brand_context=None):
     if not isinstance(competitors, list):
         competitors = []
 
-    cleaned_payload = clean_html_for_llm(website_html)
+    cleaned_payload = clean_html_for_llm(website_html, document=document)
     cleaned_site_text = cleaned_payload["clean_text"]
     logger.info(
         "Cleaned HTML length: %s chars (down from %s) using %s",
@@ -1006,12 +1408,54 @@ Return this exact schema (all keys required):
   "keyword_gaps": [""]
 }}
 """
-
-    result = gemini_analysis(prompt)
-    result["extraction"] = cleaned_payload
-    result["overview_meta"] = {
+    overview_meta = {
         "source_type": overview_source_type,
         "fetch_mode": overview_fetch_mode,
         "confidence": overview_confidence,
     }
+    cache_key = _llm_cache_key(
+        {
+            "brand_name": brand_name,
+            "keyword": keyword,
+            "brand_category": brand_category,
+            "competitors": competitors,
+        },
+        cleaned_site_text,
+        ai_text,
+        overview_meta,
+    )
+    return prompt, cleaned_payload, overview_meta, cache_key
+
+
+def ai_analysis(
+    ai_overview,
+    website_html,
+    brand_context=None,
+    bypass_cache=False,
+    progress_callback=None,
+    document=None,
+):
+    """
+    Main AI analysis function.
+    Combines AI overview and website content, sends to provider.
+    bypass_cache: skip the LLM cache lookup (a fresh result still refreshes the entry).
+    progress_callback: enables streaming; called with byte/token counts and the
+    normalized sections that have completed so far.
+    document: the scan's ParsedDocument, so extraction reuses the pipeline's parse.
+    """
+    if DEV_MODE:
+        return mock_response()
+
+    prompt, cleaned_payload, overview_meta, cache_key = _build_analysis_request(
+        ai_overview, website_html, brand_context, document
+    )
+    result = _cached_analysis(cache_key, bypass_cache)
+    if result is None:
+        if progress_callback is not None:
+            result, parsed_ok = _run_gemini_stream(prompt, progress_callback)
+        else:
+            result, parsed_ok = _run_gemini(prompt)
+        _store_analysis(cache_key, result, parsed_ok)
+    result["extraction"] = cleaned_payload
+    result["overview_meta"] = overview_meta
     return result
@@ -3,19 +3,21 @@ AnswerScope AI - Analysis Pipeline Module
 Handles the complete analysis pipeline with real API integrations.
 """
 
-import asyncio
 import os
-import requests
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timezone
 
-from playwright.async_api import async_playwright
 from dotenv import load_dotenv
 
 from .ai_engine import ai_analysis
-from .scoring import calculate_las, calculate_trust_score
+from .browser_pool import get_browser_pool
+from .cache import build_cache
+from .document import parse_document
+from .http_client import http_get
+from .scoring import calculate_las, calculate_trust_score, extract_trust_signals
 from .logger import get_logger
 
 load_dotenv()
@@ -25,6 +27,37 @@ logger = get_logger(__name__)
 logger.info("Python version: %s", sys.version)
 logger.info("Playwright available: True")
 
+PIPELINE_SEARCH_TIMEOUT_SEC = float(os.environ.get("PIPELINE_SEARCH_TIMEOUT_SEC", "65"))
+PIPELINE_SCRAPE_TIMEOUT_SEC = float(os.environ.get("PIPELINE_SCRAPE_TIMEOUT_SEC", "90"))
+
+SERPAPI_GL = os.environ.get("SERPAPI_GL", "us")
+SERPAPI_HL = os.environ.get("SERPAPI_HL", "en")
+
+# Search context cache keyed by (keyword, gl, hl, brand_category).
+SEARCH_CACHE = build_cache(
+    "serpapi_overview",
+    backend=os.environ.get("SEARCH_CACHE_BACKEND", "memory"),
+    max_entries=int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.environ.get("SEARCH_CACHE_TTL_SEC", "21600")),
+)
+# Only contexts SerpApi actually answered are cached; fallback, empty, error and
+# timeout contexts are not, so the next scan retries SerpApi.
+_CACHEABLE_SOURCE_TYPES = {
+    "ai_overview",
+    "shopping_graph",
+    "local_pack",
+    "related_questions",
+    "answer_box",
+    "knowledge_graph",
+    "organic",
+}
+
+# Shared by all pipelines; a timed-out stage keeps its worker until the call returns.
+_STAGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(2, int(os.environ.get("PIPELINE_STAGE_WORKERS", "8"))),
+    thread_name_prefix="pipeline-stage",
+)
+
 
 def _clean_join(parts):
     cleaned = [p.strip() for p in parts if isinstance(p, str) and p.strip()]
@@ -255,7 +288,15 @@ def _clean_fallback_text(keyword):
     )
 
 
-def _followup_ai_overview(serpapi_key, keyword, page_token=None, serpapi_link=None):
+def _followup_ai_overview(
+    serpapi_key,
+    keyword,
+    page_token=None,
+    serpapi_link=None,
+    gl=SERPAPI_GL,
+    hl=SERPAPI_HL,
+    deadline=None,
+):
     try:
         if page_token:
             params = {
@@ -263,11 +304,15 @@ def _followup_ai_overview(serpapi_key, keyword, page_token=None, serpapi_link=No
                 "engine": "google_ai_overview",
                 "q": keyword,
                 "page_token": page_token,
-                "gl": "us",
-                "hl": "en",
+                "gl": gl,
+                "hl": hl,
             }
-            response = requests.get(
-                "https://serpapi.com/search", params=params, timeout=30
+            response = http_get(
+                "https://serpapi.com/search",
+                params=params,
+                timeout=30,
+                label="serpapi.ai_overview",
+                deadline=deadline,
             )
             if response.status_code == 200:
                 return response.json()
@@ -278,7 +323,9 @@ def _followup_ai_overview(serpapi_key, keyword, page_token=None, serpapi_link=No
             )
 
         if serpapi_link:
-            response = requests.get(serpapi_link, timeout=30)
+            response = http_get(
+                serpapi_link, timeout=30, label="serpapi.followup_link", deadline=deadline
+            )
             if response.status_code == 200:
                 return response.json()
             logger.warning(
@@ -291,7 +338,51 @@ def _followup_ai_overview(serpapi_key, keyword, page_token=None, serpapi_link=No
     return None
 
 
-def fetch_google_ai_overview(keyword, brand_category="generic"):
+def _search_cache_key(keyword, gl, hl, brand_category):
+    return (
+        str(keyword or "").strip().lower(),
+        gl,
+        hl,
+        (brand_category or "generic").strip().lower(),
+    )
+
+
+def search_cache_stats():
+    return SEARCH_CACHE.stats() if SEARCH_CACHE is not None else None
+
+
+def fetch_google_ai_overview(
+    keyword,
+    brand_category="generic",
+    gl=SERPAPI_GL,
+    hl=SERPAPI_HL,
+    use_cache=True,
+    deadline=None,
+):
+    """
+    Cached front for _fetch_google_ai_overview.
+    Returns the normalized overview dict; `raw` is not retained on cache hits.
+    deadline: time.perf_counter() value after which SerpApi calls are not retried.
+    """
+    cache = SEARCH_CACHE if use_cache else None
+    cache_key = _search_cache_key(keyword, gl, hl, brand_category)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if isinstance(cached, dict):
+            logger.info("Search context cache hit for keyword: %s", keyword)
+            return {**cached, "raw": {}, "cache_hit": True}
+
+    overview = _fetch_google_ai_overview(
+        keyword, brand_category=brand_category, gl=gl, hl=hl, deadline=deadline
+    )
+    if cache is not None and overview.get("source_type") in _CACHEABLE_SOURCE_TYPES:
+        cache.set(cache_key, {k: v for k, v in overview.items() if k != "raw"})
+    return overview
+
+
+def _fetch_google_ai_overview(
+    keyword, brand_category="generic", gl=SERPAPI_GL, hl=SERPAPI_HL, deadline=None
+):
     """
     Fetch AI overview from Google using SerpApi.
     Priority:
@@ -335,11 +426,17 @@ def fetch_google_ai_overview(keyword, brand_category="generic"):
             "engine": "google",
             "q": keyword,
             "google_domain": "google.com",
-            "gl": "us",
-            "hl": "en",
+            "gl": gl,
+            "hl": hl,
             "num": 5,
         }
-        response = requests.get("https://serpapi.com/search", params=params, timeout=30)
+        response = http_get(
+            "https://serpapi.com/search",
+            params=params,
+            timeout=30,
+            label="serpapi.search",
+            deadline=deadline,
+        )
         if response.status_code != 200:
             logger.error("SerpApi Error %s: %s", response.status_code, response.text)
             return {
@@ -379,6 +476,9 @@ def fetch_google_ai_overview(keyword, brand_category="generic"):
                         keyword,
                         page_token=page_token,
                         serpapi_link=serpapi_link,
+                        gl=gl,
+                        hl=hl,
+                        deadline=deadline,
                     )
                     if isinstance(follow_data, dict):
                         follow_ai = (
@@ -479,115 +579,140 @@ def fetch_google_ai_overview(keyword, brand_category="generic"):
         }
 
 
-async def _scrape_website_async(url):
-    """Async function for Playwright scraping."""
-    logger.info("Starting Playwright scrape: %s", url)
-
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-gpu",
-                    "--disable-web-security",
-                ],
-            )
+_CONTEXT_OPTIONS = {
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    ),
+    "viewport": {"width": 1280, "height": 720},
+    "ignore_https_errors": True,
+}
+
+
+def _error_html(title, error):
+    return f"<html><body><h1>{title}</h1><p>{str(error)}</p></body></html>"
 
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/91.0.4472.124 Safari/537.36"
-                ),
-                viewport={"width": 1280, "height": 720},
-                ignore_https_errors=True,
-            )
 
+async def _capture_page_async(url, screenshot_path=None):
+    """
+    Load the page once on a pooled browser and return HTML, timing metadata and,
+    when `screenshot_path` is given, a full-page screenshot from the same navigation.
+    """
+    logger.info("Starting Playwright capture: %s", url)
+    result = {
+        "success": False,
+        "html": "",
+        "screenshot_captured": False,
+        "captured_at": None,
+        "dom_loaded_ms": None,
+    }
+
+    try:
+        async with get_browser_pool().context(**_CONTEXT_OPTIONS) as context:
             page = await context.new_page()
             try:
+                start = time.perf_counter()
                 await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                result["dom_loaded_ms"] = round((time.perf_counter() - start) * 1000.0, 2)
                 await page.wait_for_timeout(2000)
-                html = await page.content()
-                logger.info("Scraped %s characters", len(html))
-                await browser.close()
-                return html
+                result["html"] = await page.content()
+                result["captured_at"] = datetime.now(timezone.utc).isoformat()
+                result["success"] = True
+                logger.info("Scraped %s characters", len(result["html"]))
             except Exception as nav_error:
                 logger.error("Navigation error: %s", nav_error)
-                await browser.close()
-                return (
-                    "<html><body><h1>Navigation Error</h1>"
-                    f"<p>{str(nav_error)}</p></body></html>"
-                )
-        except Exception as e:
-            logger.exception("Playwright setup error")
-            return f"<html><body><h1>Playwright Error</h1><p>{str(e)}</p></body></html>"
-
-
-async def _capture_screenshot_async(url, screenshot_path):
-    """Capture only a screenshot (no HTML) and return timing metadata."""
-    logger.info("Capturing screenshot: %s", url)
-
-    async with async_playwright() as p:
-        try:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-gpu",
-                    "--disable-web-security",
-                ],
-            )
+                result["html"] = _error_html("Navigation Error", nav_error)
+                return result
+
+            if screenshot_path:
+                try:
+                    await page.screenshot(path=screenshot_path, full_page=True)
+                    result["screenshot_captured"] = True
+                except Exception:
+                    logger.exception("Screenshot capture failed")
+            return result
+    except Exception as e:
+        logger.exception("Playwright setup error")
+        result["html"] = _error_html("Playwright Error", e)
+        return result
 
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/91.0.4472.124 Safari/537.36"
-                ),
-                viewport={"width": 1280, "height": 720},
-                ignore_https_errors=True,
-            )
 
-            page = await context.new_page()
-            start = time.perf_counter()
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            dom_loaded_ms = round((time.perf_counter() - start) * 1000.0, 2)
-            await page.wait_for_timeout(2000)
-            await page.screenshot(path=screenshot_path, full_page=True)
-            await browser.close()
-            return {
-                "success": True,
-                "captured_at": datetime.now(timezone.utc).isoformat(),
-                "dom_loaded_ms": dom_loaded_ms,
-            }
-        except Exception:
-            logger.exception("Screenshot capture failed")
-            return {
-                "success": False,
-                "captured_at": None,
-                "dom_loaded_ms": None,
-            }
+def capture_page(url, screenshot_path=None):
+    """
+    Single-navigation capture: HTML, dom_loaded_ms and optional screenshot.
+    The result can be handed to run_analysis_pipeline as `page_capture`.
+    """
+    try:
+        return get_browser_pool().run(_capture_page_async, url, screenshot_path)
+    except Exception as e:
+        logger.exception("Async loop error (capture page)")
+        return {
+            "success": False,
+            "html": _error_html("Scraping Error", e),
+            "screenshot_captured": False,
+            "captured_at": None,
+            "dom_loaded_ms": None,
+        }
 
 
 def scrape_website_content(url):
     """
-    Wrapper for async scraping.
+    Sync wrapper for scraping; runs on the shared browser pool loop.
+    """
+    return capture_page(url)["html"]
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000.0, 2)
+
+
+def _timed_stage(fn, *args, **kwargs):
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return value, _elapsed_ms(start)
+
+
+def _join_stage(future, stage, deadline, fallback, stage_timings):
+    """
+    Wait for a fanned-out stage until its deadline; use `fallback()` on timeout or error.
     """
     try:
-        return asyncio.run(_scrape_website_async(url))
-    except Exception as e:
-        logger.exception("Async loop error")
-        return f"<html><body><h1>Scraping Error</h1><p>{str(e)}</p></body></html>"
+        value, elapsed_ms = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        stage_timings[stage] = elapsed_ms
+        return value
+    except FutureTimeoutError:
+        logger.warning("Pipeline stage '%s' timed out", stage)
+        stage_timings[f"{stage}_timed_out"] = True
+    except Exception:
+        logger.exception("Pipeline stage '%s' failed", stage)
+    return fallback()
+
+
+def _search_timeout_overview(keyword):
+    return {
+        "text": _clean_fallback_text(keyword),
+        "source_type": "timeout",
+        "fetch_mode": "none",
+        "confidence": "low",
+        "citations": [],
+        "raw": {"warning": "search context timed out"},
+    }
 
 
-def run_analysis_pipeline(keyword, url, brand_context=None):
+def run_analysis_pipeline(
+    keyword,
+    url,
+    brand_context=None,
+    page_capture=None,
+    bypass_cache=False,
+    ai_progress_callback=None,
+):
     """
     Main analysis pipeline.
+    page_capture: optional result of capture_page(); reused instead of scraping again.
+    bypass_cache: force fresh search context and model output for this request.
+    ai_progress_callback: stream the model call and report partial sections (see ai_analysis).
     """
     logger.info("Starting pipeline for: %s -> %s", keyword, url)
 
@@ -596,18 +721,65 @@ def run_analysis_pipeline(keyword, url, brand_context=None):
     brand_context["keyword"] = keyword
 
     brand_category = (brand_context.get("brand_category") or "generic").strip().lower()
-    # Pipeline contract: search context first, website evidence second, then normalized AI output.
-    ai_overview = fetch_google_ai_overview(keyword, brand_category=brand_category)
-    html = scrape_website_content(url)
+    # Pipeline contract: search context and website evidence are independent, so they are
+    # fetched concurrently and joined before the normalized AI output is produced.
+    pipeline_start = time.perf_counter()
+    stage_timings = {}
+    search_deadline = pipeline_start + PIPELINE_SEARCH_TIMEOUT_SEC
+    search_future = _STAGE_EXECUTOR.submit(
+        _timed_stage,
+        fetch_google_ai_overview,
+        keyword,
+        brand_category=brand_category,
+        use_cache=not bypass_cache,
+        deadline=search_deadline,
+    )
+    scrape_future = None
+    if page_capture and page_capture.get("success"):
+        html = page_capture.get("html") or ""
+    else:
+        scrape_future = _STAGE_EXECUTOR.submit(_timed_stage, scrape_website_content, url)
+
+    ai_overview = _join_stage(
+        search_future,
+        "search_context",
+        search_deadline,
+        lambda: _search_timeout_overview(keyword),
+        stage_timings,
+    )
+    if scrape_future is not None:
+        html = _join_stage(
+            scrape_future,
+            "scrape",
+            pipeline_start + PIPELINE_SCRAPE_TIMEOUT_SEC,
+            lambda: _error_html("Scraping Error", "Website scrape timed out"),
+            stage_timings,
+        )
+
+    # Parse once for extraction; trust scoring scans the raw HTML separately.
+    parse_start = time.perf_counter()
+    document = parse_document(html)
+    stage_timings["parse"] = _elapsed_ms(parse_start)
 
     logger.info("Calling AI engine...")
-    ai_result = ai_analysis(ai_overview, html, brand_context=brand_context)
+    ai_start = time.perf_counter()
+    ai_result = ai_analysis(
+        ai_overview,
+        html,
+        brand_context=brand_context,
+        bypass_cache=bypass_cache,
+        progress_callback=ai_progress_callback,
+        document=document,
+    )
+    stage_timings["ai_analysis"] = _elapsed_ms(ai_start)
 
     las_score = calculate_las(ai_result)
+    trust_signals = extract_trust_signals(html)
     trust_score = calculate_trust_score(
         html,
         citations=ai_overview.get("citations", []),
         technical_audit=ai_result.get("technical_audit", []),
+        signals=trust_signals,
     )
     charts = ai_result.get("charts", {}) if isinstance(ai_result, dict) else {}
     if isinstance(charts, dict):
@@ -616,6 +788,9 @@ def run_analysis_pipeline(keyword, url, brand_context=None):
             av["labels"] = ["Citation Authority", "Visibility"]
             av["values"] = [trust_score, ai_result.get("visibility", 0)]
 
+    stage_timings["total"] = _elapsed_ms(pipeline_start)
+    logger.info("Pipeline stage timings (ms): %s", stage_timings)
+
     # Persist extraction metadata so async status/history endpoints can explain result confidence.
     extraction_meta = ai_result.get("extraction", {})
     overview_text = ai_overview.get("text", "")
@@ -625,6 +800,7 @@ def run_analysis_pipeline(keyword, url, brand_context=None):
         "las_score": las_score,
         "trust_score": trust_score,
         "citation_authority": trust_score,
+        "trust_signals": trust_signals,
         "analysis": ai_result,
         "analysis_language": ai_result.get("language", "en"),
         "charts": ai_result.get("charts", {}),
@@ -643,6 +819,7 @@ def run_analysis_pipeline(keyword, url, brand_context=None):
         "clean_char_count": extraction_meta.get("clean_char_count"),
         "source_char_count": extraction_meta.get("source_char_count"),
         "html_preview": html[:300] + "...",
+        "stage_timings_ms": stage_timings,
     }
 
 
@@ -658,14 +835,12 @@ def generate_screenshot_path():
 
 def capture_screenshot(url, screenshot_path):
     """
-    Sync wrapper for screenshot capture.
+    Sync wrapper for screenshot capture; runs on the shared browser pool loop.
     """
-    try:
-        return asyncio.run(_capture_screenshot_async(url, screenshot_path))
-    except Exception:
-        logger.exception("Async loop error (capture screenshot)")
-        return {
-            "success": False,
-            "captured_at": None,
-            "dom_loaded_ms": None,
-        }
+    capture = capture_page(url, screenshot_path)
+    success = capture["screenshot_captured"]
+    return {
+        "success": success,
+        "captured_at": capture["captured_at"] if success else None,
+        "dom_loaded_ms": capture["dom_loaded_ms"] if success else None,
+    }
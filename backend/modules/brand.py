@@ -8,6 +8,7 @@ No Flask routes. No AI logic. No scraping.
 import json
 
 from .database import get_db_connection
+from .events import BRAND_PROFILE_CREATED, publish
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -37,6 +38,7 @@ def create_brand_profile(user_id, brand_name, website_url, competitors, brand_ca
         
         brand_profile_id = cursor.lastrowid
         conn.commit()
+        publish(BRAND_PROFILE_CREATED, user_id=user_id, brand_profile_id=brand_profile_id)
         return brand_profile_id
     except Exception as e:
         logger.exception("Error creating brand profile")
@@ -0,0 +1,268 @@
+"""
+AnswerScope AI - Browser Pool Module
+Keeps a small set of warm Chromium browsers alive for scraping and screenshots.
+No Flask routes. No AI logic.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+BROWSER_POOL_SIZE = max(1, int(os.environ.get("BROWSER_POOL_SIZE", "2")))
+BROWSER_POOL_MAX_PAGES = max(1, int(os.environ.get("BROWSER_POOL_MAX_PAGES", "50")))
+BROWSER_POOL_START_TIMEOUT_SEC = float(os.environ.get("BROWSER_POOL_START_TIMEOUT_SEC", "60"))
+# Upper bound on one run() call, including the wait for a free browser.
+BROWSER_POOL_RUN_TIMEOUT_SEC = float(os.environ.get("BROWSER_POOL_RUN_TIMEOUT_SEC", "120"))
+
+CHROMIUM_LAUNCH_ARGS = [
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-gpu",
+    "--disable-web-security",
+]
+
+
+class _PooledBrowser:
+    """One pool slot. The underlying browser is replaced when it is recycled."""
+
+    def __init__(self, slot_id):
+        self.slot_id = slot_id
+        self.browser = None
+        self.pages_served = 0
+        self.launched_at = None
+
+
+class BrowserPool:
+    """
+    Process-wide Chromium pool.
+    Playwright objects are bound to the event loop that created them, so the pool
+    owns a dedicated loop thread and callers submit coroutines to it. Every job
+    gets a fresh, isolated browser context; browsers are health-checked on
+    checkout and recycled after serving `max_pages` contexts.
+    """
+
+    def __init__(
+        self,
+        size=BROWSER_POOL_SIZE,
+        max_pages=BROWSER_POOL_MAX_PAGES,
+        run_timeout_sec=BROWSER_POOL_RUN_TIMEOUT_SEC,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.run_timeout_sec = run_timeout_sec
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._idle = None
+        self._slots = []
+        self._started = False
+        self._closed = False
+        self._stats = {
+            "launches": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+            "contexts_served": 0,
+            "waits": 0,
+            "run_timeouts": 0,
+        }
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool has been shut down")
+            if self._started:
+                return
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop, name="browser-pool", daemon=True
+                )
+                self._thread.start()
+            future = asyncio.run_coroutine_threadsafe(self._start(), self._loop)
+            future.result(timeout=BROWSER_POOL_START_TIMEOUT_SEC)
+            self._started = True
+            logger.info(
+                "Browser pool ready: size=%s max_pages=%s", self.size, self.max_pages
+            )
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        self._idle = asyncio.Queue()
+        self._slots = [_PooledBrowser(slot_id) for slot_id in range(self.size)]
+        try:
+            for slot in self._slots:
+                await self._launch(slot)
+                self._idle.put_nowait(slot)
+        except Exception:
+            await self._stop()
+            raise
+
+    async def _launch(self, slot):
+        slot.browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=CHROMIUM_LAUNCH_ARGS,
+        )
+        slot.pages_served = 0
+        slot.launched_at = time.time()
+        self._stats["launches"] += 1
+
+    async def _retire(self, slot):
+        browser = slot.browser
+        slot.browser = None
+        if browser is None:
+            return
+        try:
+            await browser.close()
+        except Exception:
+            logger.warning("Browser close failed for pool slot %s", slot.slot_id)
+
+    async def _acquire(self):
+        if self._idle.empty():
+            self._stats["waits"] += 1
+        slot = await self._idle.get()
+        try:
+            if slot.browser is None or not slot.browser.is_connected():
+                self._stats["unhealthy"] += 1
+                await self._retire(slot)
+                await self._launch(slot)
+            elif slot.pages_served >= self.max_pages:
+                self._stats["recycled"] += 1
+                await self._retire(slot)
+                await self._launch(slot)
+        except Exception:
+            # Keep the slot in rotation; the next checkout retries the launch.
+            self._idle.put_nowait(slot)
+            raise
+        return slot
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """
+        Yield a fresh browser context from a pooled browser.
+        Must be used from coroutines submitted through `run`.
+        """
+        slot = await self._acquire()
+        browser_context = None
+        try:
+            browser_context = await slot.browser.new_context(**context_options)
+            slot.pages_served += 1
+            self._stats["contexts_served"] += 1
+            yield browser_context
+        finally:
+            if browser_context is not None:
+                try:
+                    await browser_context.close()
+                except Exception:
+                    logger.warning("Browser context close failed (slot %s)", slot.slot_id)
+            self._idle.put_nowait(slot)
+
+    def run(self, coro_fn, *args, **kwargs):
+        """
+        Run `coro_fn(*args, **kwargs)` on the pool loop and block for its result.
+        After `run_timeout_sec` the task is cancelled (its browser context is closed
+        and the slot returned) and TimeoutError is raised.
+        """
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(coro_fn(*args, **kwargs), self._loop)
+        try:
+            return future.result(timeout=self.run_timeout_sec)
+        except FutureTimeoutError:
+            future.cancel()
+            self._stats["run_timeouts"] += 1
+            name = getattr(coro_fn, "__name__", repr(coro_fn))
+            logger.warning("Browser pool task %s timed out after %ss", name, self.run_timeout_sec)
+            raise TimeoutError(
+                f"Browser pool task {name} did not finish within {self.run_timeout_sec}s"
+            ) from None
+
+    def stats(self):
+        healthy = sum(
+            1 for slot in self._slots if slot.browser is not None and slot.browser.is_connected()
+        )
+        return {
+            "size": self.size,
+            "max_pages": self.max_pages,
+            "started": self._started,
+            "healthy_browsers": healthy,
+            "idle_browsers": self._idle.qsize() if self._idle is not None else 0,
+            **self._stats,
+        }
+
+    async def _stop(self):
+        for slot in self._slots:
+            await self._retire(slot)
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                logger.warning("Playwright stop failed")
+            self._playwright = None
+
+    def shutdown(self, timeout=30):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._loop is None:
+                return
+            try:
+                if self._started:
+                    asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result(
+                        timeout=timeout
+                    )
+            except Exception:
+                logger.exception("Browser pool shutdown failed")
+            finally:
+                self._started = False
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=timeout)
+        logger.info("Browser pool shut down")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """
+    Return the process-wide browser pool, creating it on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(shutdown_browser_pool)
+        return _pool
+
+
+def shutdown_browser_pool():
+    global _pool
+    with _pool_lock:
+        pool = _pool
+        _pool = None
+    if pool is not None:
+        pool.shutdown()
+
+
+def browser_pool_stats():
+    """
+    Stats for the browser pool, or None if no scrape has created it yet.
+    """
+    pool = _pool
+    return pool.stats() if pool is not None else None
@@ -0,0 +1,250 @@
+"""
+AnswerScope AI - Cache Module
+Small TTL + LRU caches shared by the analysis and dashboard layers.
+No Flask routes. No AI logic.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .database import get_db_connection
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry expiry.
+    Keys must be hashable; values are stored as-is.
+    """
+
+    def __init__(self, name, max_entries=512, ttl_seconds=3600):
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key, value, ttl_seconds=None):
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def delete_where(self, predicate):
+        """Drop every entry whose key matches `predicate(key)`; returns the count."""
+        with self._lock:
+            doomed = [key for key in self._entries if predicate(key)]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "name": self.name,
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self._stats,
+            }
+
+
+class SQLiteTTLCache:
+    """
+    TTL + LRU cache persisted in the `cache_entries` table so entries survive restarts.
+    Keys are JSON-serialized; values must be JSON-serializable.
+    """
+
+    def __init__(self, name, max_entries=2048, ttl_seconds=3600):
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, sort_keys=True, default=str)
+
+    def _count(self, field):
+        with self._lock:
+            self._stats[field] += 1
+
+    def get(self, key, default=None):
+        cache_key = self._key(key)
+        now = time.time()
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT value_json, expires_at FROM cache_entries
+                WHERE namespace = ? AND cache_key = ?
+                """,
+                (self.name, cache_key),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                self._count("misses")
+                return default
+            if row["expires_at"] <= now:
+                cursor.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                    (self.name, cache_key),
+                )
+                conn.commit()
+                self._count("expirations")
+                self._count("misses")
+                return default
+            cursor.execute(
+                """
+                UPDATE cache_entries SET last_access = ?
+                WHERE namespace = ? AND cache_key = ?
+                """,
+                (now, self.name, cache_key),
+            )
+            conn.commit()
+            self._count("hits")
+            return json.loads(row["value_json"])
+        except Exception:
+            logger.exception("Cache read failed (%s)", self.name)
+            self._count("misses")
+            return default
+        finally:
+            conn.close()
+
+    def set(self, key, value, ttl_seconds=None):
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        now = time.time()
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO cache_entries (
+                    namespace, cache_key, value_json, expires_at, last_access
+                ) VALUES (?, ?, ?, ?, ?)
+                """,
+                (self.name, self._key(key), json.dumps(value), now + ttl, now),
+            )
+            # Expired rows go first, then least-recently-used rows beyond the bound.
+            cursor.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                (self.name, now),
+            )
+            cursor.execute(
+                """
+                DELETE FROM cache_entries
+                WHERE namespace = ? AND cache_key IN (
+                    SELECT cache_key FROM cache_entries
+                    WHERE namespace = ?
+                    ORDER BY last_access DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.name, self.name, self.max_entries),
+            )
+            evicted = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+            conn.commit()
+            if evicted:
+                with self._lock:
+                    self._stats["evictions"] += evicted
+        except Exception:
+            logger.exception("Cache write failed (%s)", self.name)
+        finally:
+            conn.close()
+
+    def delete(self, key):
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?",
+                (self.name, self._key(key)),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = get_db_connection()
+        try:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.name,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self):
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(*) AS total FROM cache_entries WHERE namespace = ?",
+                (self.name,),
+            )
+            entries = int(cursor.fetchone()["total"] or 0)
+        except Exception:
+            entries = None
+        finally:
+            conn.close()
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "name": self.name,
+                "backend": "sqlite",
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self._stats,
+            }
+
+
+def build_cache(name, backend="memory", max_entries=512, ttl_seconds=3600):
+    """
+    Build a cache for `backend` ("memory", "sqlite" or "none").
+    Returns None when caching is disabled.
+    """
+    backend = (backend or "memory").strip().lower()
+    if backend in ("none", "off", "0", "false"):
+        return None
+    if backend == "sqlite":
+        return SQLiteTTLCache(name, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    return TTLCache(name, max_entries=max_entries, ttl_seconds=ttl_seconds)
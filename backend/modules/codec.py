@@ -0,0 +1,223 @@
+"""
+AnswerScope AI - JSON Codec Module
+Transparent compression for large JSON report columns, plus a backfill for old rows.
+No Flask routes. No AI logic.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import zlib
+
+from .database import get_db_connection
+from .logger import get_logger
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover
+    zstandard = None
+
+logger = get_logger(__name__)
+
+JSON_CODEC = os.environ.get("JSON_CODEC", "zlib").strip().lower()
+JSON_CODEC_LEVEL = int(os.environ.get("JSON_CODEC_LEVEL", "6"))
+JSON_CODEC_MIN_BYTES = int(os.environ.get("JSON_CODEC_MIN_BYTES", "512"))
+JSON_CODEC_BACKFILL = os.environ.get("JSON_CODEC_BACKFILL", "1").strip().lower() not in (
+    "0",
+    "false",
+    "no",
+    "off",
+)
+JSON_CODEC_BACKFILL_BATCH = int(os.environ.get("JSON_CODEC_BACKFILL_BATCH", "200"))
+
+# Stored values are either legacy JSON text or a BLOB that starts with one of these.
+ZLIB_MARKER = b"ZJ1:"
+ZSTD_MARKER = b"ZS1:"
+
+# (table, primary key, columns) holding encoded JSON.
+ENCODED_COLUMNS = (
+    ("scan_results", "id", ("raw_report_json", "breakdown_json")),
+    ("analysis_jobs", "job_id", ("result_json",)),
+)
+
+
+def _compress(raw):
+    if JSON_CODEC == "zstd" and zstandard is not None:
+        level = max(1, min(22, JSON_CODEC_LEVEL))
+        return ZSTD_MARKER + zstandard.ZstdCompressor(level=level).compress(raw)
+    return ZLIB_MARKER + zlib.compress(raw, max(1, min(9, JSON_CODEC_LEVEL)))
+
+
+def encode_text(text):
+    """
+    Encode a JSON string for storage. Short payloads (and JSON_CODEC=none) stay text.
+    """
+    if text is None:
+        return None
+    if JSON_CODEC in ("none", "off", "0") or len(text) < JSON_CODEC_MIN_BYTES:
+        return text
+    return _compress(text.encode("utf-8"))
+
+
+def encode_json(value):
+    return encode_text(json.dumps(value))
+
+
+def is_encoded(stored):
+    return isinstance(stored, (bytes, bytearray, memoryview)) and bytes(stored[:4]) in (
+        ZLIB_MARKER,
+        ZSTD_MARKER,
+    )
+
+
+def decode_text(stored):
+    """
+    Return the JSON text for a stored value, whichever format it was written in.
+    """
+    if stored is None or isinstance(stored, str):
+        return stored
+    data = bytes(stored)
+    marker, payload = data[:4], data[4:]
+    if marker == ZLIB_MARKER:
+        return zlib.decompress(payload).decode("utf-8")
+    if marker == ZSTD_MARKER:
+        if zstandard is None:
+            raise RuntimeError("zstd-encoded value found but `zstandard` is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    return data.decode("utf-8")
+
+
+def decode_json(stored, default=None):
+    """
+    Decode a stored column back to Python. Empty values return `default`.
+    """
+    text = decode_text(stored)
+    if not text:
+        return default
+    return json.loads(text)
+
+
+def backfill_encoded_columns(batch_size=JSON_CODEC_BACKFILL_BATCH, pause_sec=0.05):
+    """
+    Re-encode legacy text rows in small keyset batches (one short transaction each).
+    Only text values at or above JSON_CODEC_MIN_BYTES are selected: shorter ones stay
+    text when encoded, so rows already examined are not read again on the next run.
+    Returns {table: rows_rewritten}.
+    """
+    rewritten = {}
+    for table, pk, columns in ENCODED_COLUMNS:
+        rewritten[table] = 0
+        last_key = None
+        # length() counts characters for text, as len() does in encode_text.
+        text_filter = " OR ".join(
+            f"(typeof({column}) = 'text' AND length({column}) >= {int(JSON_CODEC_MIN_BYTES)})"
+            for column in columns
+        )
+        while True:
+            conn = get_db_connection()
+            try:
+                cursor = conn.cursor()
+                # Read and rewrite under one write lock so concurrent writers are not clobbered.
+                cursor.execute("BEGIN IMMEDIATE")
+                key_filter = f"{pk} > ? AND " if last_key is not None else ""
+                cursor.execute(
+                    f"SELECT {pk}, {', '.join(columns)} FROM {table} "
+                    f"WHERE {key_filter}({text_filter}) ORDER BY {pk} LIMIT ?",
+                    ([last_key] if last_key is not None else []) + [batch_size],
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                updates = []
+                for row in rows:
+                    encoded = [
+                        encode_text(row[column]) if isinstance(row[column], str) else row[column]
+                        for column in columns
+                    ]
+                    if any(is_encoded(value) for value in encoded):
+                        updates.append(encoded + [row[pk]])
+                    last_key = row[pk]
+                if updates:
+                    cursor.executemany(
+                        f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} "
+                        f"WHERE {pk} = ?",
+                        updates,
+                    )
+                conn.commit()
+                rewritten[table] += len(updates)
+            finally:
+                conn.close()
+            if len(rows) < batch_size:
+                break
+            time.sleep(pause_sec)
+    return rewritten
+
+
+def storage_stats():
+    """
+    Stored bytes and encoded-row counts for each encoded column.
+    """
+    stats = {}
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        for table, _, columns in ENCODED_COLUMNS:
+            for column in columns:
+                cursor.execute(
+                    f"""
+                    SELECT COUNT({column}) AS total_rows,
+                           SUM(CASE WHEN typeof({column}) = 'blob' THEN 1 ELSE 0 END) AS encoded_rows,
+                           SUM(LENGTH(CAST({column} AS BLOB))) AS stored_bytes
+                    FROM {table}
+                    """
+                )
+                row = cursor.fetchone()
+                stats[f"{table}.{column}"] = {
+                    "rows": int(row["total_rows"] or 0),
+                    "encoded_rows": int(row["encoded_rows"] or 0),
+                    "stored_bytes": int(row["stored_bytes"] or 0),
+                }
+    finally:
+        conn.close()
+    return stats
+
+
+def start_background_backfill():
+    """
+    Compress legacy rows on a daemon thread (no-op when JSON_CODEC_BACKFILL=0).
+    """
+    if not JSON_CODEC_BACKFILL or JSON_CODEC in ("none", "off", "0"):
+        return None
+
+    def _run():
+        try:
+            rewritten = backfill_encoded_columns()
+            if any(rewritten.values()):
+                logger.info("Compressed legacy JSON rows: %s", rewritten)
+        except Exception:
+            logger.exception("JSON column backfill failed")
+
+    thread = threading.Thread(target=_run, name="json-codec-backfill", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    """
+    CLI: python -m backend.modules.codec [backfill|stats]
+    """
+    parser = argparse.ArgumentParser(prog="python -m backend.modules.codec")
+    parser.add_argument("command", choices=("backfill", "stats"), nargs="?", default="stats")
+    parser.add_argument("--batch-size", type=int, default=JSON_CODEC_BACKFILL_BATCH)
+    args = parser.parse_args(argv)
+    if args.command == "backfill":
+        print(f"Rows rewritten: {backfill_encoded_columns(batch_size=args.batch_size)}")
+    for name, row in storage_stats().items():
+        print(f"{name}: {row['encoded_rows']}/{row['rows']} encoded, {row['stored_bytes']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
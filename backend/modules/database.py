@@ -4,15 +4,34 @@ Handles SQLite setup and schema initialization.
 Follows PRD Table Definitions exactly.
 """
 
+import argparse
+import atexit
 import os
 import sqlite3
+import threading
+from collections import deque
 
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
 BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BACKEND_DIR, "database.db")
+DB_PATH = os.environ.get("SQLITE_DB_PATH") or os.path.join(BACKEND_DIR, "database.db")
+SQLITE_POOL_SIZE = int(os.environ.get("SQLITE_POOL_SIZE", "8"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL").strip().upper()
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL").strip().upper()
+SQLITE_CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", "16384"))
+SQLITE_MMAP_SIZE_MB = int(os.environ.get("SQLITE_MMAP_SIZE_MB", "128"))
+SQLITE_AUTO_MIGRATE = os.environ.get("SQLITE_AUTO_MIGRATE", "1").strip().lower() not in (
+    "0",
+    "false",
+    "no",
+    "off",
+)
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
 
 def _table_columns(conn, table_name):
     cursor = conn.cursor()
@@ -94,6 +113,8 @@ def _create_base_tables(conn):
             extraction_method TEXT,
             error TEXT,
             result_json TEXT,
+            partial_result_json TEXT,
+            stream_bytes INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users (id)
@@ -167,6 +188,18 @@ def _create_base_tables(conn):
         )
     ''')
 
+    # Persistent TTL cache entries (e.g. SerpApi search context)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            namespace TEXT NOT NULL,
+            cache_key TEXT NOT NULL,
+            value_json TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            PRIMARY KEY (namespace, cache_key)
+        )
+    ''')
+
 def _ensure_backwards_compatibility(conn):
     # Existing DBs may have older table shapes
     for column_name, column_type in (
@@ -206,6 +239,8 @@ def _ensure_backwards_compatibility(conn):
         ("overview_source_type", "TEXT"),
         ("overview_fetch_mode", "TEXT"),
         ("extraction_method", "TEXT"),
+        ("partial_result_json", "TEXT"),
+        ("stream_bytes", "INTEGER"),
     ):
         _ensure_column(conn, "analysis_jobs", column_name, column_type)
 
@@ -235,17 +270,442 @@ def _create_indexes(conn):
         CREATE INDEX IF NOT EXISTS idx_prompt_obs_brand_time
         ON prompt_observations(brand_profile_id, recorded_at)
     ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_cache_entries_access
+        ON cache_entries(namespace, last_access)
+    ''')
 
-def ensure_schema():
+def _apply_pragmas(conn):
+    """
+    Lock-wait, journaling and cache PRAGMAs. journal_mode is persisted in the
+    database file; the rest are per-connection.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {max(0, SQLITE_BUSY_TIMEOUT_MS)}")
+    if SQLITE_JOURNAL_MODE in _JOURNAL_MODES:
+        mode = cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}").fetchone()
+        if mode and str(mode[0]).upper() != SQLITE_JOURNAL_MODE:
+            logger.warning("journal_mode %s requested, SQLite kept %s", SQLITE_JOURNAL_MODE, mode[0])
+    else:
+        logger.warning("Ignoring unknown SQLITE_JOURNAL_MODE=%s", SQLITE_JOURNAL_MODE)
+    if SQLITE_SYNCHRONOUS in _SYNCHRONOUS_MODES:
+        cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    else:
+        logger.warning("Ignoring unknown SQLITE_SYNCHRONOUS=%s", SQLITE_SYNCHRONOUS)
+    # Negative cache_size is in KiB rather than pages.
+    cursor.execute(f"PRAGMA cache_size = {-max(0, SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size = {max(0, SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+
+def _migrate_baseline(conn):
+    # Tables, columns and indexes as of the first versioned release. Databases
+    # created before schema_version existed are brought up to shape here.
+    _create_base_tables(conn)
+    _ensure_backwards_compatibility(conn)
+    _create_indexes(conn)
+
+def _add_scan_artifact_counts(conn):
+    # Row counts written with each scan, so insights need not COUNT(*) them.
+    _ensure_column(conn, "scan_results", "artifact_counts_json", "TEXT")
+
+# Indexes the dashboard and job paths depend on: (name, table, columns).
+# Migrations create them; check_index_usage() verifies the planner picks them.
+MANAGED_INDEXES = (
+    ("idx_scan_metrics_brand_keyword_time", "scan_metrics", "brand_profile_id, keyword, recorded_at"),
+    ("idx_scan_metrics_scan_metric", "scan_metrics", "scan_id, metric_key"),
+    ("idx_scan_metrics_brand_comp_time", "scan_metrics", "brand_profile_id, competitor_domain, recorded_at"),
+    (
+        "idx_scan_metrics_brand_metric_time",
+        "scan_metrics",
+        "brand_profile_id, metric_key, recorded_at, metric_value",
+    ),
+    ("idx_scan_citations_brand_time", "scan_citations", "brand_profile_id, recorded_at"),
+    ("idx_scan_citations_scan", "scan_citations", "scan_id, citation_domain"),
+    ("idx_scan_events_job_time", "scan_run_events", "job_id, created_at"),
+    ("idx_scan_events_scan", "scan_run_events", "scan_id"),
+    ("idx_prompt_obs_brand_time", "prompt_observations", "brand_profile_id, recorded_at"),
+    ("idx_prompt_obs_scan", "prompt_observations", "scan_id"),
+    ("idx_scan_results_brand_time", "scan_results", "brand_profile_id, timestamp"),
+    ("idx_brand_profiles_user_created", "brand_profiles", "user_id, created_at"),
+    ("idx_cache_entries_access", "cache_entries", "namespace, last_access"),
+)
+
+# Hot read queries and the index each is expected to use: name -> (sql, params, index).
+HOT_QUERIES = {
+    "latest_brand_profile": (
+        "SELECT id FROM brand_profiles WHERE user_id = ? ORDER BY created_at DESC LIMIT 1",
+        (1,),
+        "idx_brand_profiles_user_created",
+    ),
+    "scan_history": (
+        "SELECT id, keyword, timestamp FROM scan_results WHERE brand_profile_id = ? "
+        "ORDER BY timestamp DESC, id DESC LIMIT 21",
+        (1,),
+        "idx_scan_results_brand_time",
+    ),
+    "scan_history_page": (
+        "SELECT id, keyword, timestamp FROM scan_results WHERE brand_profile_id = ? "
+        "AND (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT 21",
+        (1, "2100-01-01 00:00:00", 1),
+        "idx_scan_results_brand_time",
+    ),
+    "insights_latest_scan": (
+        "SELECT sr.id, ss.scan_metrics FROM scan_results sr "
+        "LEFT JOIN scan_summaries ss ON ss.scan_id = sr.id WHERE sr.brand_profile_id = ? "
+        "ORDER BY sr.timestamp DESC, sr.id DESC LIMIT 1",
+        (1,),
+        "idx_scan_results_brand_time",
+    ),
+    "trend_points": (
+        "SELECT day, value_sum, value_count FROM metric_daily_rollups WHERE brand_profile_id = ? "
+        "AND metric_key = ? AND day >= ? ORDER BY day ASC",
+        (1, "visibility_score", "2000-01-01"),
+        "PRIMARY KEY",
+    ),
+    "citation_share": (
+        "SELECT citation_domain, SUM(mentions) AS mentions FROM citation_daily_rollups "
+        "WHERE brand_profile_id = ? AND day >= ? GROUP BY citation_domain "
+        "ORDER BY mentions DESC LIMIT 50",
+        (1, "2000-01-01"),
+        "PRIMARY KEY",
+    ),
+    "scan_citation_domains": (
+        "SELECT citation_domain, COUNT(*) AS mentions FROM scan_citations WHERE scan_id = ? "
+        "GROUP BY citation_domain ORDER BY mentions DESC LIMIT 5",
+        (1,),
+        "idx_scan_citations_scan",
+    ),
+    "scan_prompt_count": (
+        "SELECT COUNT(*) FROM prompt_observations WHERE scan_id = ?",
+        (1,),
+        "idx_prompt_obs_scan",
+    ),
+    "scan_metric_count": (
+        "SELECT COUNT(*) FROM scan_metrics WHERE scan_id = ?",
+        (1,),
+        "idx_scan_metrics_scan_metric",
+    ),
+    "scan_event_count": (
+        "SELECT COUNT(*) FROM scan_run_events WHERE scan_id = ?",
+        (1,),
+        "idx_scan_events_scan",
+    ),
+}
+
+def _create_managed_indexes(conn):
+    for name, table, columns in MANAGED_INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+    conn.execute("ANALYZE")
+
+def explain_query_plan(conn, sql, params=()):
+    """
+    Return the EXPLAIN QUERY PLAN detail lines for `sql`.
+    """
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+def check_index_usage(conn=None):
+    """
+    Plan every HOT_QUERIES entry and report whether it uses its expected index.
+    Returns {name: {"index": str, "uses_index": bool, "plan": [str]}}.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+    try:
+        report = {}
+        for name, (sql, params, index) in HOT_QUERIES.items():
+            plan = explain_query_plan(conn, sql, params)
+            report[name] = {
+                "index": index,
+                "uses_index": any(index in line for line in plan),
+                "plan": plan,
+            }
+        return report
+    finally:
+        if own_conn:
+            conn.close()
+
+def _create_rollup_tables(conn):
+    # Daily pre-aggregates read by the trends and citation-share endpoints.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS metric_daily_rollups (
+            brand_profile_id INTEGER NOT NULL,
+            metric_key TEXT NOT NULL,
+            day TEXT NOT NULL,
+            value_sum REAL NOT NULL DEFAULT 0,
+            value_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (brand_profile_id, metric_key, day)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS citation_daily_rollups (
+            brand_profile_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            citation_domain TEXT NOT NULL,
+            mentions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (brand_profile_id, day, citation_domain)
+        ) WITHOUT ROWID
+    ''')
+
+_METRIC_ROLLUP_SQL = '''
+    INSERT INTO metric_daily_rollups (brand_profile_id, metric_key, day, value_sum, value_count)
+    SELECT brand_profile_id, metric_key, date(recorded_at), SUM(metric_value), COUNT(*)
+    FROM scan_metrics
+    WHERE {where}
+    GROUP BY brand_profile_id, metric_key, date(recorded_at)
+    ON CONFLICT (brand_profile_id, metric_key, day) DO UPDATE SET
+        value_sum = value_sum + excluded.value_sum,
+        value_count = value_count + excluded.value_count
+'''
+# NULL domains are stored as '' so they still collapse onto one key.
+_CITATION_ROLLUP_SQL = '''
+    INSERT INTO citation_daily_rollups (brand_profile_id, day, citation_domain, mentions)
+    SELECT brand_profile_id, date(recorded_at), COALESCE(citation_domain, ''), COUNT(*)
+    FROM scan_citations
+    WHERE {where}
+    GROUP BY brand_profile_id, date(recorded_at), COALESCE(citation_domain, '')
+    ON CONFLICT (brand_profile_id, day, citation_domain) DO UPDATE SET
+        mentions = mentions + excluded.mentions
+'''
+
+def apply_scan_rollups(cursor, scan_id):
+    """
+    Fold one scan's metric and citation rows into the daily rollups.
+    Runs on the caller's transaction (save_scan_result) so both commit together.
+    """
+    cursor.execute(_METRIC_ROLLUP_SQL.format(where="scan_id = ?"), (scan_id,))
+    cursor.execute(_CITATION_ROLLUP_SQL.format(where="scan_id = ?"), (scan_id,))
+
+def rebuild_daily_rollups(conn):
+    """
+    Recompute both rollup tables from the raw rows. Caller commits.
+    """
+    conn.execute("DELETE FROM metric_daily_rollups")
+    conn.execute("DELETE FROM citation_daily_rollups")
+    conn.execute(_METRIC_ROLLUP_SQL.format(where="1 = 1"))
+    conn.execute(_CITATION_ROLLUP_SQL.format(where="1 = 1"))
+
+def _migrate_daily_rollups(conn):
+    _create_rollup_tables(conn)
+    rebuild_daily_rollups(conn)
+
+_BRAND_SCAN_STATE_SQL = '''
+    INSERT INTO brand_scan_state (brand_profile_id, scan_count, last_scan_at)
+    SELECT brand_profile_id, COUNT(*), MAX(timestamp)
+    FROM scan_results
+    WHERE brand_profile_id IS NOT NULL AND {where}
+    GROUP BY brand_profile_id
+    ON CONFLICT (brand_profile_id) DO UPDATE SET
+        scan_count = scan_count + excluded.scan_count,
+        last_scan_at = MAX(COALESCE(last_scan_at, ''), excluded.last_scan_at)
+'''
+
+def apply_scan_state(cursor, scan_id):
+    """
+    Count one new scan against its brand in brand_scan_state.
+    Runs on the caller's transaction, like apply_scan_rollups.
+    """
+    cursor.execute(_BRAND_SCAN_STATE_SQL.format(where="id = ?"), (scan_id,))
+    bump_data_version(cursor, [scan_id])
+
+def bump_data_version(cursor, scan_ids=None):
+    """
+    Mark the dashboard data of the brands owning `scan_ids` (every brand when
+    None) as changed, which invalidates their dashboard ETags.
+    """
+    where = ""
+    params = []
+    if scan_ids is not None:
+        scan_ids = list(scan_ids)
+        if not scan_ids:
+            return
+        placeholders = ", ".join("?" for _ in scan_ids)
+        where = (
+            " WHERE brand_profile_id IN "
+            f"(SELECT brand_profile_id FROM scan_results WHERE id IN ({placeholders}))"
+        )
+        params = scan_ids
+    cursor.execute(
+        "UPDATE brand_scan_state SET data_version = data_version + 1, "
+        f"data_updated_at = CURRENT_TIMESTAMP{where}",
+        params,
+    )
+
+def rebuild_brand_scan_state(conn):
+    """
+    Recount brand_scan_state from scan_results. Caller commits.
+    Rows are reset rather than deleted so data versions keep increasing.
+    """
+    conn.execute("UPDATE brand_scan_state SET scan_count = 0, last_scan_at = NULL")
+    conn.execute(_BRAND_SCAN_STATE_SQL.format(where="1 = 1"))
+
+def _migrate_brand_scan_state(conn):
+    # Per-brand scan counter, so paginated history can report a total without COUNT(*).
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS brand_scan_state (
+            brand_profile_id INTEGER PRIMARY KEY,
+            scan_count INTEGER NOT NULL DEFAULT 0,
+            last_scan_at TIMESTAMP
+        )
+    ''')
+    rebuild_brand_scan_state(conn)
+
+def _add_brand_data_version(conn):
+    # Bumped whenever a brand's dashboard data changes; dashboard ETags derive from it.
+    _ensure_column(conn, "brand_scan_state", "data_version", "INTEGER NOT NULL DEFAULT 0")
+    _ensure_column(conn, "brand_scan_state", "data_updated_at", "TIMESTAMP")
+    conn.execute(
+        "UPDATE brand_scan_state SET data_version = 1, "
+        "data_updated_at = COALESCE(last_scan_at, CURRENT_TIMESTAMP)"
+    )
+
+# Per-scan counters shown by dashboard insights, written once at save time.
+SCAN_SUMMARY_FIELDS = (
+    "scan_metrics",
+    "scan_citations",
+    "prompt_observations",
+    "scan_run_events",
+    "competitor_domains",
+    "action_plan_items",
+    "technical_audit_items",
+    "diagnostics_items",
+    "executive_summary_items",
+    "raw_report_present",
+    "breakdown_present",
+)
+
+def _create_scan_summaries(conn):
+    # Scans saved before this table existed get their row from the startup backfill
+    # (summaries.backfill_scan_summaries).
+    columns = ",\n".join(
+        f"            {field} INTEGER NOT NULL DEFAULT 0" for field in SCAN_SUMMARY_FIELDS
+    )
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS scan_summaries (
+            scan_id INTEGER PRIMARY KEY,
+{columns}
+        )
+    ''')
+
+def _drop_scan_artifact_counts(conn):
+    # Superseded by scan_summaries; scans without a summary row are counted live by
+    # the startup backfill. DROP COLUMN needs SQLite 3.35+; older builds keep the
+    # column, unread.
+    if sqlite3.sqlite_version_info < (3, 35, 0):
+        return
+    if "artifact_counts_json" in _table_columns(conn, "scan_results"):
+        conn.execute("ALTER TABLE scan_results DROP COLUMN artifact_counts_json")
+
+def write_scan_summary(cursor, scan_id, summary):
+    """
+    Insert or replace the scan_summaries row for `scan_id`. Missing fields are 0.
+    """
+    values = [int(summary.get(field) or 0) for field in SCAN_SUMMARY_FIELDS]
+    cursor.execute(
+        f"INSERT OR REPLACE INTO scan_summaries (scan_id, {', '.join(SCAN_SUMMARY_FIELDS)}) "
+        f"VALUES (?, {', '.join('?' for _ in SCAN_SUMMARY_FIELDS)})",
+        [scan_id] + values,
+    )
+
+def apply_scan_event_counts(cursor, event_counts):
+    """
+    Add newly persisted run events ({scan_id: n}) to their scan summaries and
+    mark the owning brands' dashboard data as changed.
+    """
+    if not event_counts:
+        return
+    cursor.executemany(
+        "UPDATE scan_summaries SET scan_run_events = scan_run_events + ? WHERE scan_id = ?",
+        [(count, scan_id) for scan_id, count in event_counts.items()],
+    )
+    bump_data_version(cursor, event_counts)
+
+# Ordered (version, name, apply) registry. Append new migrations; never edit
+# or renumber one that has shipped.
+MIGRATIONS = (
+    (1, "baseline", _migrate_baseline),
+    (2, "scan_artifact_counts", _add_scan_artifact_counts),
+    (3, "dashboard_indexes", _create_managed_indexes),
+    (4, "daily_rollups", _migrate_daily_rollups),
+    (5, "brand_scan_state", _migrate_brand_scan_state),
+    (6, "brand_data_version", _add_brand_data_version),
+    (7, "scan_summaries", _create_scan_summaries),
+    (8, "drop_scan_artifact_counts", _drop_scan_artifact_counts),
+)
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def _ensure_version_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _current_version(conn):
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return int(row[0] or 0)
+
+def _pending_migrations(conn):
+    current = _current_version(conn)
+    return [migration for migration in MIGRATIONS if migration[0] > current]
+
+def schema_status():
+    """
+    Return {"current": n, "latest": n, "pending": [names]} without migrating.
+    """
     conn = sqlite3.connect(DB_PATH)
     try:
-        _create_base_tables(conn)
-        _ensure_backwards_compatibility(conn)
-        _create_indexes(conn)
-        conn.commit()
+        _ensure_version_table(conn)
+        return {
+            "current": _current_version(conn),
+            "latest": LATEST_SCHEMA_VERSION,
+            "pending": [name for _, name, _ in _pending_migrations(conn)],
+        }
+    finally:
+        conn.close()
+
+def run_migrations():
+    """
+    Apply pending migrations in order, each in its own IMMEDIATE transaction so
+    concurrent processes serialize. Returns the list of applied versions.
+    """
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    applied = []
+    try:
+        _apply_pragmas(conn)
+        _ensure_version_table(conn)
+        if not _pending_migrations(conn):
+            return applied
+        for version, name, apply in MIGRATIONS:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check under the write lock; another process may have won.
+                if version <= _current_version(conn):
+                    conn.execute("COMMIT")
+                    continue
+                apply(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                    (version, name),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                logger.exception("Migration %s (%s) failed", version, name)
+                raise
+            applied.append(version)
+            logger.info("Applied migration %s (%s)", version, name)
+        return applied
     finally:
         conn.close()
 
+def ensure_schema():
+    """
+    Run pending migrations. At the latest version this is a single SELECT.
+    """
+    return run_migrations()
+
 def init_db():
     """
     Initialize SQLite database with required tables.
@@ -254,16 +714,209 @@ def init_db():
     ensure_schema()
     logger.info("Initialized at %s", DB_PATH)
 
-def get_db_connection():
+def _configure_connection(conn):
     """
-    Returns a new SQLite connection with row factory.
+    Per-connection setup, run once when the pool opens a connection.
     """
-    conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row  # Access columns by name
-    return conn
+    _apply_pragmas(conn)
 
-# Auto-initialize on import
-if not os.path.exists(DB_PATH):
-    init_db()
-else:
-    ensure_schema()
+
+class PooledConnection:
+    """
+    Checked-out pool connection. Behaves like sqlite3.Connection; close()
+    hands the underlying connection back to the pool instead of closing it.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def _raw(self):
+        if self.__dict__.get("_conn") is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return self._conn
+
+    def __getattr__(self, name):
+        return getattr(self._raw(), name)
+
+    def __enter__(self):
+        self._raw().__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw().__exit__(exc_type, exc, tb)
+
+    def close(self):
+        conn, self._conn = self.__dict__.get("_conn"), None
+        if conn is not None:
+            self._pool.release(conn)
+
+    def __del__(self):
+        # A caller that forgot close() should not leak a slot.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Bounded LIFO pool of configured SQLite connections.
+    Checkout never blocks: when no idle connection exists a new one is opened,
+    and connections returned to a full pool are closed.
+    """
+
+    def __init__(self, db_path, max_idle=SQLITE_POOL_SIZE):
+        self.db_path = db_path
+        self.max_idle = max(0, int(max_idle))
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._stats = {
+            "opened": 0,
+            "reused": 0,
+            "released": 0,
+            "closed": 0,
+            "discarded": 0,
+            "rolled_back": 0,
+            "checked_out": 0,
+            "peak_checked_out": 0,
+        }
+
+    def _open(self):
+        # Connections move between request/worker threads, one owner at a time.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        _configure_connection(conn)
+        return conn
+
+    def acquire(self):
+        conn = None
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                self._stats["reused"] += 1
+            self._stats["checked_out"] += 1
+            self._stats["peak_checked_out"] = max(
+                self._stats["peak_checked_out"], self._stats["checked_out"]
+            )
+        if conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                with self._lock:
+                    self._stats["checked_out"] -= 1
+                raise
+            with self._lock:
+                self._stats["opened"] += 1
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        healthy = True
+        try:
+            # Never hand the next caller a half-finished transaction.
+            if conn.in_transaction:
+                conn.rollback()
+                with self._lock:
+                    self._stats["rolled_back"] += 1
+        except sqlite3.Error:
+            healthy = False
+
+        with self._lock:
+            self._stats["checked_out"] -= 1
+            if healthy and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                self._stats["released"] += 1
+                return
+            self._stats["closed" if healthy else "discarded"] += 1
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        with self._lock:
+            acquisitions = self._stats["opened"] + self._stats["reused"]
+            return {
+                "max_idle": self.max_idle,
+                "idle": len(self._idle),
+                "reuse_rate": round(self._stats["reused"] / acquisitions, 4) if acquisitions else 0.0,
+                **self._stats,
+            }
+
+
+_POOL = ConnectionPool(DB_PATH)
+atexit.register(_POOL.close_all)
+
+
+def get_db_connection():
+    """
+    Returns a pooled SQLite connection with row factory.
+    Callers close() it as before; that returns it to the pool.
+    """
+    return _POOL.acquire()
+
+
+def connection_pool_stats():
+    """
+    Usage counters for the SQLite connection pool.
+    """
+    return _POOL.stats()
+
+def main(argv=None):
+    """
+    CLI: python -m backend.modules.database [migrate|status|indexes|rebuild-rollups]
+    """
+    parser = argparse.ArgumentParser(prog="python -m backend.modules.database")
+    parser.add_argument(
+        "command",
+        choices=("migrate", "status", "indexes", "rebuild-rollups"),
+        nargs="?",
+        default="status",
+    )
+    args = parser.parse_args(argv)
+    if args.command == "rebuild-rollups":
+        conn = get_db_connection()
+        try:
+            rebuild_daily_rollups(conn)
+            rebuild_brand_scan_state(conn)
+            bump_data_version(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        print("Rebuilt daily rollups and brand scan counters")
+        return 0
+    if args.command == "indexes":
+        report = check_index_usage()
+        for name, row in report.items():
+            marker = "ok " if row["uses_index"] else "MISSING"
+            print(f"[{marker}] {name}: {row['index']} | {'; '.join(row['plan'])}")
+        return 0 if all(row["uses_index"] for row in report.values()) else 1
+    if args.command == "migrate":
+        applied = run_migrations()
+        print(f"Applied migrations: {applied or 'none'}")
+    status = schema_status()
+    print(
+        f"Schema version {status['current']}/{status['latest']}"
+        f" (pending: {', '.join(status['pending']) or 'none'})"
+    )
+    return 0
+
+# Auto-initialize on import (set SQLITE_AUTO_MIGRATE=0 to migrate out-of-band)
+if SQLITE_AUTO_MIGRATE:
+    if not os.path.exists(DB_PATH):
+        init_db()
+    else:
+        ensure_schema()
+elif os.path.exists(DB_PATH) and schema_status()["pending"]:
+    logger.warning(
+        "Schema has pending migrations; run `python -m backend.modules.database migrate`"
+    )
+
+if __name__ == "__main__":
+    raise SystemExit(main())
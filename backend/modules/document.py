@@ -0,0 +1,169 @@
+"""
+AnswerScope AI - Parsed Document Module
+Parses scraped HTML once per scan (lxml) and exposes what content extraction needs.
+No Flask routes. No AI logic.
+"""
+
+import copy
+import re
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+BOILERPLATE_TAGS = (
+    "script",
+    "style",
+    "svg",
+    "footer",
+    "nav",
+    "noscript",
+    "header",
+    "aside",
+    "form",
+)
+BOILERPLATE_PATTERN = re.compile(
+    r"menu|nav|breadcrumb|footer|header|sidebar|cookie|banner",
+    re.IGNORECASE,
+)
+
+
+def _node_text(node, separator=" "):
+    parts = [part.strip() for part in node.itertext() if part and part.strip()]
+    return separator.join(parts)
+
+
+def _is_boilerplate(element):
+    if element.tag in BOILERPLATE_TAGS:
+        return True
+    combined = f"{element.get('class', '')} {element.get('id', '')}".strip()
+    return bool(combined and BOILERPLATE_PATTERN.search(combined))
+
+
+class _Boilerplate:
+    """
+    Boilerplate subtrees of a shared tree, skipped in place instead of pruned from a
+    copy. lxml keeps one proxy per node while it is referenced, so these sets stay
+    valid for the document's lifetime.
+    """
+
+    def __init__(self, tree):
+        self.roots = set()  # boilerplate elements (not the document root)
+        self.hidden = set()  # every element inside a boilerplate subtree
+        self.dirty = set()  # ancestors of boilerplate elements
+        for element in tree.iter():
+            if (
+                isinstance(element.tag, str)
+                and element not in self.hidden
+                and element.getparent() is not None
+                and _is_boilerplate(element)
+            ):
+                self.roots.add(element)
+                self.hidden.update(element.iter())
+                for ancestor in element.iterancestors():
+                    if ancestor in self.dirty:
+                        break
+                    self.dirty.add(ancestor)
+
+    def elements(self, tree, tags):
+        """Document-order `tags` elements outside boilerplate subtrees."""
+        return [node for node in tree.iter(*tags) if node not in self.hidden]
+
+    def iter_text(self, node):
+        # Mirrors itertext() after drop_tree(): a skipped element's tail is glued
+        # onto the text run before it. Clean subtrees use lxml's itertext directly.
+        run = node.text or ""
+        for child in node:
+            if child in self.roots:
+                run += child.tail or ""
+                continue
+            yield run
+            if child in self.dirty:
+                yield from self.iter_text(child)
+            elif isinstance(child.tag, str):
+                yield from child.itertext()
+            run = child.tail or ""
+        yield run
+
+    def text(self, node, separator=" "):
+        parts = [part.strip() for part in self.iter_text(node) if part and part.strip()]
+        return separator.join(parts)
+
+
+def _parse_tree(raw_html):
+    if not raw_html or not raw_html.strip():
+        return None
+    try:
+        try:
+            return lxml_html.document_fromstring(raw_html)
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration.
+            return lxml_html.document_fromstring(raw_html.encode("utf-8"))
+    except (ValueError, etree.ParserError, etree.XMLSyntaxError):
+        # e.g. "Document is empty" once only the declaration is left.
+        logger.warning("HTML could not be parsed into a document tree")
+        return None
+
+
+class ParsedDocument:
+    """
+    One lxml tree per scan, shared by the content extractors and never mutated;
+    consumers that prune in place take copy_tree(). Text blocks are computed on
+    first access and cached. Trust scoring scans the raw HTML
+    (scoring.TrustSignalScanner), not this tree.
+    """
+
+    def __init__(self, raw_html):
+        self.raw_html = raw_html or ""
+        self.tree = _parse_tree(self.raw_html)
+        self._text_blocks = None
+        self._boilerplate_view = None
+
+    def copy_tree(self):
+        """Deep copy for consumers that mutate the tree (e.g. trafilatura)."""
+        return copy.deepcopy(self.tree) if self.tree is not None else None
+
+    @property
+    def _boilerplate(self):
+        if self._boilerplate_view is None and self.tree is not None:
+            self._boilerplate_view = _Boilerplate(self.tree)
+        return self._boilerplate_view
+
+    @property
+    def text_blocks(self):
+        """Title, h1/h2 headings and substantial p/li blocks outside boilerplate."""
+        if self._text_blocks is None:
+            blocks = []
+            tree = self.tree
+            if tree is not None:
+                title = tree.find(".//title")
+                if title is not None:
+                    title_text = _node_text(title)
+                    if title_text:
+                        blocks.append(title_text)
+                boilerplate = self._boilerplate
+                for node in boilerplate.elements(tree, ("h1", "h2")):
+                    text = boilerplate.text(node)
+                    if text:
+                        blocks.append(text)
+                for node in boilerplate.elements(tree, ("p", "li")):
+                    text = boilerplate.text(node)
+                    if text and len(text) >= 30:
+                        blocks.append(text)
+            self._text_blocks = blocks
+        return self._text_blocks
+
+    def full_text(self, separator="\n"):
+        if self.tree is None:
+            return ""
+        return self._boilerplate.text(self.tree, separator=separator)
+
+
+def parse_document(raw_html):
+    """
+    Build the shared ParsedDocument for a scan.
+    """
+    return ParsedDocument(raw_html)
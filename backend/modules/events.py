@@ -0,0 +1,53 @@
+"""
+AnswerScope AI - Events Module
+In-process publish/subscribe for write notifications, so read-side caches can
+drop stale entries without the writers knowing about them.
+No Flask routes. No AI logic.
+"""
+
+import threading
+from collections import defaultdict
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Published after the write has committed.
+SCAN_SAVED = "scan_saved"  # brand_profile_id, scan_id
+BRAND_PROFILE_CREATED = "brand_profile_created"  # user_id, brand_profile_id
+
+_SUBSCRIBERS = defaultdict(list)
+_LOCK = threading.Lock()
+
+
+def subscribe(event_name, handler):
+    """
+    Call `handler(**payload)` for every `event_name` published in this process.
+    """
+    with _LOCK:
+        if handler not in _SUBSCRIBERS[event_name]:
+            _SUBSCRIBERS[event_name].append(handler)
+
+
+def unsubscribe(event_name, handler):
+    with _LOCK:
+        if handler in _SUBSCRIBERS[event_name]:
+            _SUBSCRIBERS[event_name].remove(handler)
+
+
+def publish(event_name, **payload):
+    """
+    Deliver an event to its subscribers synchronously. A failing handler is
+    logged and skipped; it never fails the write that published the event.
+    Returns the number of handlers that ran successfully.
+    """
+    with _LOCK:
+        handlers = list(_SUBSCRIBERS.get(event_name, ()))
+    delivered = 0
+    for handler in handlers:
+        try:
+            handler(**payload)
+            delivered += 1
+        except Exception:
+            logger.exception("Event handler failed for %s", event_name)
+    return delivered
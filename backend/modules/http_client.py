@@ -0,0 +1,140 @@
+"""
+AnswerScope AI - HTTP Client Module
+Pooled keep-alive HTTP sessions with retry/backoff for outbound search calls.
+No Flask routes. No AI logic.
+"""
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "16"))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_BASE_SEC = float(os.environ.get("HTTP_BACKOFF_BASE_SEC", "0.5"))
+HTTP_BACKOFF_MAX_SEC = float(os.environ.get("HTTP_BACKOFF_MAX_SEC", "8"))
+# A retry needs at least this much of the caller's deadline left after backing off.
+HTTP_MIN_ATTEMPT_SEC = float(os.environ.get("HTTP_MIN_ATTEMPT_SEC", "2"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# One adapter (and therefore one urllib3 connection pool per host) is shared by every
+# thread's session; urllib3 pools are thread-safe, requests.Session state is not.
+_ADAPTER = HTTPAdapter(
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    max_retries=0,
+)
+_local = threading.local()
+
+
+def get_http_session():
+    """
+    Return this thread's session, mounted on the shared keep-alive pool.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", _ADAPTER)
+        session.mount("http://", _ADAPTER)
+        _local.session = session
+    return session
+
+
+def _backoff_delay(attempt, response=None):
+    # Full jitter keeps concurrent workers from retrying in lockstep.
+    delay = random.uniform(0, min(HTTP_BACKOFF_MAX_SEC, HTTP_BACKOFF_BASE_SEC * (2 ** attempt)))
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return min(delay, HTTP_BACKOFF_MAX_SEC)
+
+
+def _remaining(deadline):
+    return None if deadline is None else deadline - time.perf_counter()
+
+
+def _retry_fits(deadline, delay):
+    remaining = _remaining(deadline)
+    return remaining is None or remaining - delay >= HTTP_MIN_ATTEMPT_SEC
+
+
+def http_get(
+    url,
+    params=None,
+    timeout=30,
+    label=None,
+    max_retries=HTTP_MAX_RETRIES,
+    deadline=None,
+    retry_read_timeout=False,
+):
+    """
+    GET with connection reuse, jittered retry on 429/5xx and transport errors,
+    and per-attempt latency logging. Query params are never logged (API keys).
+    Returns the final requests.Response or raises the last transport error.
+    deadline: time.perf_counter() value the caller stops waiting at. Each attempt's
+    timeout is clipped to it and no retry starts that could not finish before it.
+    retry_read_timeout: a read timeout means the server may already have done (and
+    billed) the work, so it is only retried when the caller says the call is safe.
+    """
+    session = get_http_session()
+    host = urlparse(url).netloc
+    label = label or host
+    for attempt in range(max_retries + 1):
+        remaining = _remaining(deadline)
+        if remaining is not None and remaining <= 0:
+            raise requests.Timeout(f"HTTP {label} deadline exceeded before attempt {attempt + 1}")
+        attempt_timeout = timeout if remaining is None else min(timeout, remaining)
+        start = time.perf_counter()
+        try:
+            response = session.get(url, params=params, timeout=attempt_timeout)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            logger.warning(
+                "HTTP %s %s failed after %.1f ms (attempt %s): %s",
+                label,
+                host,
+                elapsed_ms,
+                attempt + 1,
+                exc.__class__.__name__,
+            )
+            if attempt >= max_retries:
+                raise
+            if isinstance(exc, requests.ReadTimeout) and not retry_read_timeout:
+                raise
+            delay = _backoff_delay(attempt)
+            if not _retry_fits(deadline, delay):
+                logger.warning("HTTP %s %s not retried: stage deadline reached", label, host)
+                raise
+            time.sleep(delay)
+            continue
+
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        logger.info(
+            "HTTP %s %s -> %s in %.1f ms (attempt %s)",
+            label,
+            host,
+            response.status_code,
+            elapsed_ms,
+            attempt + 1,
+        )
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            delay = _backoff_delay(attempt, response)
+            if not _retry_fits(deadline, delay):
+                logger.warning("HTTP %s %s not retried: stage deadline reached", label, host)
+                return response
+            time.sleep(delay)
+            continue
+        return response
+    return response
@@ -0,0 +1,307 @@
+"""
+AnswerScope AI - Job Store Module
+Write-behind state for async analysis jobs: status polls read memory, while
+progress updates and run events reach SQLite in coalesced transactions.
+No Flask routes. No AI logic.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from .database import apply_scan_event_counts, get_db_connection
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_STORE_FLUSH_INTERVAL_SEC = float(os.environ.get("JOB_STORE_FLUSH_INTERVAL_SEC", "2"))
+# Extra attempts (with doubling backoff) for flushes that carry a completed/failed state.
+JOB_STORE_TERMINAL_FLUSH_RETRIES = int(os.environ.get("JOB_STORE_TERMINAL_FLUSH_RETRIES", "3"))
+JOB_STORE_TERMINAL_FLUSH_BACKOFF_SEC = float(
+    os.environ.get("JOB_STORE_TERMINAL_FLUSH_BACKOFF_SEC", "0.2")
+)
+
+JOB_FIELDS = (
+    "status",
+    "stage_label",
+    "progress",
+    "screenshot_url",
+    "captured_at",
+    "dom_loaded_ms",
+    "overview_source_type",
+    "overview_fetch_mode",
+    "extraction_method",
+    "error",
+    "result_json",
+    "partial_result_json",
+    "stream_bytes",
+)
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def _db_timestamp():
+    # Same format SQLite uses for CURRENT_TIMESTAMP (UTC, second precision).
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class JobStore:
+    """
+    In-process job state with write-behind persistence.
+    Non-terminal updates are buffered and flushed every flush interval;
+    completed/failed updates and events are flushed before the call returns,
+    with retries; if those still fail the state stays buffered for the next flush.
+    State lives in this process only, so polls must reach the worker's process.
+    """
+
+    def __init__(self, flush_interval_sec=JOB_STORE_FLUSH_INTERVAL_SEC):
+        self.flush_interval_sec = max(0.0, float(flush_interval_sec))
+        self._jobs = {}
+        self._dirty = {}
+        self._events = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._stats = {
+            "updates": 0,
+            "events": 0,
+            "flushes": 0,
+            "job_rows_written": 0,
+            "event_rows_written": 0,
+            "flush_errors": 0,
+        }
+
+    def _ensure_flusher(self):
+        if self.flush_interval_sec <= 0 or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._flush_loop, name="job-store-flush", daemon=True
+                )
+                self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval_sec)
+            self._wake.clear()
+            self.flush()
+
+    def create(self, job_id, user_id, scan_context_id, est_duration_sec):
+        """
+        Insert the job row immediately so it exists for any reader, then track it.
+        """
+        now = _db_timestamp()
+        conn = get_db_connection()
+        try:
+            conn.execute(
+                """
+                INSERT INTO analysis_jobs (
+                    job_id, user_id, scan_context_id, est_duration_sec, status, stage_label,
+                    progress, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, user_id, scan_context_id, est_duration_sec, "queued", "Queued", 0, now, now),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        with self._lock:
+            job = {field: None for field in JOB_FIELDS}
+            job.update(
+                {
+                    "job_id": job_id,
+                    "user_id": user_id,
+                    "scan_context_id": scan_context_id,
+                    "est_duration_sec": est_duration_sec,
+                    "status": "queued",
+                    "stage_label": "Queued",
+                    "progress": 0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            self._jobs[job_id] = job
+        self._ensure_flusher()
+
+    def update(self, job_id, **fields):
+        fields = {key: value for key, value in fields.items() if key in JOB_FIELDS}
+        if not fields:
+            return
+        fields["updated_at"] = _db_timestamp()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+            self._dirty.setdefault(job_id, {}).update(fields)
+            self._stats["updates"] += 1
+        if fields.get("status") in TERMINAL_STATUSES:
+            self._flush_terminal(job_id)
+        elif self.flush_interval_sec <= 0:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def append_event(self, job_id, event_type, stage_label, details=None, scan_id=None):
+        with self._lock:
+            self._events.append(
+                (job_id, scan_id, event_type, stage_label, json.dumps(details or {}), _db_timestamp())
+            )
+            self._stats["events"] += 1
+        if event_type in TERMINAL_STATUSES:
+            self._flush_terminal(job_id)
+        elif self.flush_interval_sec <= 0:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def _flush_terminal(self, job_id):
+        """
+        Flush a completed/failed state, retrying so the row does not stay "running".
+        On final failure the state remains dirty (and in memory for polls), so the
+        background flusher or the next write retries it.
+        """
+        for attempt in range(JOB_STORE_TERMINAL_FLUSH_RETRIES + 1):
+            if self.flush():
+                return True
+            if attempt < JOB_STORE_TERMINAL_FLUSH_RETRIES:
+                time.sleep(JOB_STORE_TERMINAL_FLUSH_BACKOFF_SEC * (2 ** attempt))
+        logger.error(
+            "Terminal state for job %s not persisted after %s attempts; left pending",
+            job_id,
+            JOB_STORE_TERMINAL_FLUSH_RETRIES + 1,
+        )
+        self._ensure_flusher()
+        return False
+
+    def get(self, job_id):
+        """
+        Current job state: memory first, then the analysis_jobs row.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM analysis_jobs WHERE job_id = ?", (job_id,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def flush(self):
+        """
+        Write all buffered updates and events in one transaction.
+        Returns True when nothing is left pending.
+        """
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+                events, self._events = self._events, []
+            if not dirty and not events:
+                return True
+
+            try:
+                conn = get_db_connection()
+            except Exception:
+                logger.exception("Job store flush could not get a connection")
+                self._requeue(dirty, events)
+                return False
+            try:
+                cursor = conn.cursor()
+                for job_id, fields in dirty.items():
+                    columns = list(fields)
+                    cursor.execute(
+                        f"UPDATE analysis_jobs SET {', '.join(f'{c} = ?' for c in columns)} "
+                        "WHERE job_id = ?",
+                        [fields[c] for c in columns] + [job_id],
+                    )
+                if events:
+                    cursor.executemany(
+                        """
+                        INSERT INTO scan_run_events (
+                            job_id, scan_id, event_type, stage_label, details_json, created_at
+                        ) VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        events,
+                    )
+                    # Events that land after their scan row (e.g. "completed") still
+                    # count towards that scan's summary and dashboard data version.
+                    apply_scan_event_counts(
+                        cursor, Counter(event[1] for event in events if event[1] is not None)
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.exception("Job store flush failed; %s updates re-queued", len(dirty))
+                self._requeue(dirty, events)
+                return False
+            finally:
+                conn.close()
+
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["job_rows_written"] += len(dirty)
+                self._stats["event_rows_written"] += len(events)
+                # Finished jobs are durable now; later polls read the row.
+                for job_id in dirty:
+                    job = self._jobs.get(job_id)
+                    if (
+                        job is not None
+                        and job.get("status") in TERMINAL_STATUSES
+                        and job_id not in self._dirty
+                    ):
+                        del self._jobs[job_id]
+            return True
+
+    def _requeue(self, dirty, events):
+        with self._lock:
+            # Anything written since the swap is newer and wins.
+            for job_id, fields in dirty.items():
+                self._dirty[job_id] = {**fields, **self._dirty.get(job_id, {})}
+            self._events = events + self._events
+            self._stats["flush_errors"] += 1
+
+    def shutdown(self):
+        self._stopped = True
+        self._wake.set()
+        if not self.flush():
+            logger.error(
+                "Job store shut down with %s job updates and %s events unwritten",
+                len(self._dirty),
+                len(self._events),
+            )
+
+    def stats(self):
+        with self._lock:
+            return {
+                "flush_interval_sec": self.flush_interval_sec,
+                "active_jobs": len(self._jobs),
+                "pending_jobs": len(self._dirty),
+                "pending_events": len(self._events),
+                **self._stats,
+            }
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_job_store():
+    """
+    Process-wide job store, created on first use.
+    """
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = JobStore()
+                atexit.register(_STORE.shutdown)
+    return _STORE
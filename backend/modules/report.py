@@ -0,0 +1,118 @@
+"""
+AnswerScope AI - Report Storage Module
+Canonical compact form of a scan report for storage, and the view that expands
+it back to the legacy response shape on read.
+No Flask routes. No AI calls.
+"""
+
+from .ai_engine import _build_charts, _build_recommended_playbook, _to_legacy_actions
+
+REPORT_FORMAT_VERSION = 2
+
+# Top-level keys that mirror the same key inside `analysis`.
+MIRRORED_ANALYSIS_KEYS = (
+    "charts",
+    "market_intel",
+    "gap_analysis",
+    "technical_audit",
+    "action_plan",
+    "recommended_playbook",
+)
+
+
+def _derived_analysis_fields(analysis, trust_score):
+    """
+    Fields of a normalized analysis payload that are pure functions of other fields.
+    """
+    scores = analysis.get("scores") if isinstance(analysis.get("scores"), dict) else {}
+    sentiment = analysis.get("sentiment") if isinstance(analysis.get("sentiment"), dict) else {}
+    action_plan = analysis.get("action_plan") if isinstance(analysis.get("action_plan"), list) else []
+    gap_analysis = (
+        analysis.get("gap_analysis") if isinstance(analysis.get("gap_analysis"), dict) else {}
+    )
+    derived = {key: scores[key] for key in ("visibility", "content", "technical", "visual") if key in scores}
+    derived["keyword_gaps"] = gap_analysis.get("missing_keywords", [])
+    derived["actions"] = _to_legacy_actions(action_plan)
+    derived["recommended_playbook"] = _build_recommended_playbook(action_plan)
+    derived["charts"] = _build_charts(scores, sentiment, action_plan, citation_authority=trust_score)
+    return derived
+
+
+def _derived_report_fields(report, analysis):
+    derived = {key: analysis[key] for key in MIRRORED_ANALYSIS_KEYS if key in analysis}
+    if "language" in analysis:
+        derived["analysis_language"] = analysis["language"]
+    if "trust_score" in report:
+        derived["citation_authority"] = report["trust_score"]
+    overview_text = report.get("ai_overview_text")
+    if isinstance(overview_text, str):
+        derived["ai_overview_preview"] = overview_text[:150] + "..."
+    return derived
+
+
+def compact_report(report):
+    """
+    Drop every field that expand_report can rebuild exactly. Fields that differ
+    from their derived value (older payloads, hand edits) are kept as-is, so
+    compact -> expand is lossless.
+    """
+    if not isinstance(report, dict) or "report_format" in report:
+        return report
+    analysis = report.get("analysis")
+    if not isinstance(analysis, dict):
+        return report
+
+    compact_analysis = dict(analysis)
+    for key, value in _derived_analysis_fields(analysis, report.get("trust_score", 0)).items():
+        if key in compact_analysis and compact_analysis[key] == value:
+            del compact_analysis[key]
+
+    compact = dict(report)
+    for key, value in _derived_report_fields(report, analysis).items():
+        if key in compact and compact[key] == value:
+            del compact[key]
+    compact["analysis"] = compact_analysis
+    compact["report_format"] = REPORT_FORMAT_VERSION
+    return compact
+
+
+def expand_report(stored):
+    """
+    Legacy response shape for a stored report, filled in place (pass a freshly
+    decoded dict). Reports saved before the compact format (no `report_format`)
+    are returned unchanged.
+    """
+    if not isinstance(stored, dict) or "report_format" not in stored:
+        return stored
+    report = stored
+    report.pop("report_format", None)
+    analysis = report.get("analysis")
+    if not isinstance(analysis, dict):
+        return report
+
+    for key, value in _derived_analysis_fields(analysis, report.get("trust_score", 0)).items():
+        analysis.setdefault(key, value)
+    for key, value in _derived_report_fields(report, analysis).items():
+        report.setdefault(key, value)
+    return report
+
+
+def report_item_counts(report):
+    """
+    List lengths surfaced by dashboard insights. Works on compact and expanded
+    reports alike: `actions` is only consulted when `action_plan` is empty.
+    """
+    analysis = report.get("analysis") if isinstance(report, dict) else None
+    if not isinstance(analysis, dict):
+        analysis = {}
+
+    def _length(key):
+        value = analysis.get(key)
+        return len(value) if isinstance(value, list) else 0
+
+    return {
+        "action_plan_items": _length("action_plan") or _length("actions"),
+        "technical_audit_items": _length("technical_audit"),
+        "diagnostics_items": _length("diagnostics"),
+        "executive_summary_items": _length("executive_summary"),
+    }
@@ -7,31 +7,7 @@ Deterministic scoring logic only. No AI calls, no Flask.
 import re
 from html.parser import HTMLParser
 
-
-class MetaTagParser(HTMLParser):
-    """Simple parser to count meta tags in HTML."""
-    def __init__(self):
-        super().__init__()
-        self.meta_count = 0
-    
-    def handle_starttag(self, tag, attrs):
-        if tag == 'meta':
-            self.meta_count += 1
-
-
-class SchemaTagParser(HTMLParser):
-    """Counts JSON-LD blocks that may contain schema entities."""
-
-    def __init__(self):
-        super().__init__()
-        self.json_ld_count = 0
-
-    def handle_starttag(self, tag, attrs):
-        if tag != "script":
-            return
-        attrs_map = {k.lower(): (v or "") for k, v in attrs}
-        if attrs_map.get("type", "").lower() == "application/ld+json":
-            self.json_ld_count += 1
+HTTPS_REFERENCE_PATTERN = re.compile(r'https://[^\s"\']+', re.IGNORECASE)
 
 
 def _to_score(value):
@@ -62,7 +38,85 @@ def calculate_las(ai_result):
     return max(0, min(100, int(round(las))))
 
 
-def calculate_trust_score(html, citations=None, technical_audit=None):
+class TrustSignalScanner(HTMLParser):
+    """
+    Single-pass trust-signal scanner. Feed the page whole or in chunks, then call
+    signals(). meta/JSON-LD counts and the https reference feed
+    calculate_trust_score; canonical, og:* and hreflang are extras.
+    """
+
+    # Longest "https://x" prefix that can straddle two chunks.
+    _CARRY_CHARS = 8
+
+    def __init__(self):
+        super().__init__()
+        self.meta_count = 0
+        self.json_ld_count = 0
+        self.has_https_reference = False
+        self.canonical_url = ""
+        self.og_tags = {}
+        self.hreflang = []
+        self._carry = ""
+
+    def feed(self, data):
+        if not self.has_https_reference:
+            window = self._carry + data
+            if HTTPS_REFERENCE_PATTERN.search(window):
+                self.has_https_reference = True
+                self._carry = ""
+            else:
+                self._carry = window[-self._CARRY_CHARS:]
+        super().feed(data)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            self.meta_count += 1
+            attrs_map = {k.lower(): (v or "") for k, v in attrs}
+            prop = attrs_map.get("property", "").strip().lower()
+            if prop.startswith("og:") and prop not in self.og_tags:
+                self.og_tags[prop] = attrs_map.get("content", "").strip()
+        elif tag == "script":
+            attrs_map = {k.lower(): (v or "") for k, v in attrs}
+            if attrs_map.get("type", "").lower() == "application/ld+json":
+                self.json_ld_count += 1
+        elif tag == "link":
+            attrs_map = {k.lower(): (v or "") for k, v in attrs}
+            rel = attrs_map.get("rel", "").strip().lower().split()
+            href = attrs_map.get("href", "").strip()
+            if "canonical" in rel and href and not self.canonical_url:
+                self.canonical_url = href
+            lang = attrs_map.get("hreflang", "").strip()
+            if lang and "alternate" in rel:
+                self.hreflang.append(lang)
+
+    def signals(self):
+        return {
+            "has_https_reference": self.has_https_reference,
+            "meta_count": self.meta_count,
+            "json_ld_count": self.json_ld_count,
+            "canonical_url": self.canonical_url,
+            "og_tags": dict(self.og_tags),
+            "hreflang": list(self.hreflang),
+        }
+
+
+def extract_trust_signals(html):
+    """
+    Return the page-level trust signals used by calculate_trust_score.
+    Always scanned with HTMLParser: lxml's tree counts <meta>/<script> differently
+    (e.g. inside <title>, <textarea> or <iframe>), which would move the score.
+    """
+    scanner = TrustSignalScanner()
+    try:
+        scanner.feed(html or "")
+    except Exception:
+        # A page HTMLParser cannot read scores no meta/schema signal.
+        scanner.meta_count = 0
+        scanner.json_ld_count = 0
+    return scanner.signals()
+
+
+def calculate_trust_score(html, citations=None, technical_audit=None, signals=None):
     """
     Calculate citation authority score.
     Returns integer 0-100.
@@ -71,31 +125,22 @@ def calculate_trust_score(html, citations=None, technical_audit=None):
     - secure/reference signals in page links
     - metadata and schema markup presence
     - technical audit schema pass flags
+    `signals` is extract_trust_signals(html) when the caller already has it.
     """
     score = 0.0
     html = html or ""
+    if signals is None:
+        signals = extract_trust_signals(html)
 
     # Reference security signal
-    https_pattern = r'https://[^\s"\']+'
-    https_matches = re.findall(https_pattern, html, re.IGNORECASE)
-    if https_matches:
+    if signals["has_https_reference"]:
         score += 20
 
     # Metadata signal
-    parser = MetaTagParser()
-    try:
-        parser.feed(html)
-        score += min(15, parser.meta_count * 2)
-    except Exception:
-        pass
+    score += min(15, signals["meta_count"] * 2)
 
     # Schema signal from JSON-LD blocks
-    schema_parser = SchemaTagParser()
-    try:
-        schema_parser.feed(html)
-        score += min(20, schema_parser.json_ld_count * 8)
-    except Exception:
-        pass
+    score += min(20, signals["json_ld_count"] * 8)
 
     # Citation signal from AI overview sources
     citations = citations if isinstance(citations, list) else []
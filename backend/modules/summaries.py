@@ -0,0 +1,143 @@
+"""
+AnswerScope AI - Scan Summaries Module
+Builds scan_summaries rows for scans saved before that table existed, on a
+startup backfill rather than on dashboard reads.
+No Flask routes. No AI logic.
+"""
+
+import os
+import threading
+import time
+
+from .codec import decode_json
+from .database import get_db_connection, write_scan_summary
+from .logger import get_logger
+from .report import report_item_counts
+
+logger = get_logger(__name__)
+
+SCAN_SUMMARY_BACKFILL = os.environ.get("SCAN_SUMMARY_BACKFILL", "1").strip().lower() not in (
+    "0",
+    "false",
+    "no",
+    "off",
+)
+SCAN_SUMMARY_BACKFILL_BATCH = int(os.environ.get("SCAN_SUMMARY_BACKFILL_BATCH", "200"))
+
+
+def _count(cursor, query, params):
+    cursor.execute(query, params)
+    return int(cursor.fetchone()[0] or 0)
+
+
+def _artifact_counts(cursor, scan_id):
+    """
+    Row counts per artifact table for one scan.
+    """
+    return {
+        "scan_metrics": _count(
+            cursor, "SELECT COUNT(*) FROM scan_metrics WHERE scan_id = ?", (scan_id,)
+        ),
+        "scan_citations": _count(
+            cursor, "SELECT COUNT(*) FROM scan_citations WHERE scan_id = ?", (scan_id,)
+        ),
+        "prompt_observations": _count(
+            cursor, "SELECT COUNT(*) FROM prompt_observations WHERE scan_id = ?", (scan_id,)
+        ),
+        "competitor_domains": _count(
+            cursor,
+            """
+            SELECT COUNT(DISTINCT competitor_domain)
+            FROM scan_metrics
+            WHERE scan_id = ? AND competitor_domain IS NOT NULL AND TRIM(competitor_domain) != ''
+            """,
+            (scan_id,),
+        ),
+        "scan_run_events": _count(
+            cursor, "SELECT COUNT(*) FROM scan_run_events WHERE scan_id = ?", (scan_id,)
+        ),
+    }
+
+
+def build_scan_summary(cursor, scan_id):
+    """
+    Compute the scan_summaries fields for one stored scan. Read-only.
+    """
+    cursor.execute(
+        """
+        SELECT raw_report_json,
+               (breakdown_json IS NOT NULL AND LENGTH(breakdown_json) > 0) AS breakdown_present
+        FROM scan_results
+        WHERE id = ?
+        """,
+        (scan_id,),
+    )
+    raw_report_json, breakdown_present = cursor.fetchone()
+    report = decode_json(raw_report_json, {})
+    return {
+        **_artifact_counts(cursor, scan_id),
+        **report_item_counts(report),
+        "raw_report_present": bool(raw_report_json),
+        "breakdown_present": bool(
+            breakdown_present or (isinstance(report, dict) and report.get("analysis"))
+        ),
+    }
+
+
+def backfill_scan_summaries(batch_size=SCAN_SUMMARY_BACKFILL_BATCH, pause_sec=0.05):
+    """
+    Write summaries for scans that have none, in small keyset batches (one short
+    transaction each). Scans that have a row are never selected again.
+    Returns the number of summaries written.
+    """
+    written = 0
+    last_id = 0
+    while True:
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            # Count and write under one write lock so run events flushed meanwhile
+            # are not lost between the live count and the insert.
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                """
+                SELECT sr.id FROM scan_results sr
+                LEFT JOIN scan_summaries ss ON ss.scan_id = sr.id
+                WHERE ss.scan_id IS NULL AND sr.id > ?
+                ORDER BY sr.id
+                LIMIT ?
+                """,
+                (last_id, batch_size),
+            )
+            scan_ids = [row[0] for row in cursor.fetchall()]
+            for scan_id in scan_ids:
+                write_scan_summary(cursor, scan_id, build_scan_summary(cursor, scan_id))
+                last_id = scan_id
+            conn.commit()
+            written += len(scan_ids)
+        finally:
+            conn.close()
+        if len(scan_ids) < batch_size:
+            break
+        time.sleep(pause_sec)
+    return written
+
+
+def start_background_summary_backfill():
+    """
+    Summarize legacy scans on a daemon thread (no-op when SCAN_SUMMARY_BACKFILL=0).
+    """
+    if not SCAN_SUMMARY_BACKFILL:
+        return None
+
+    def _run():
+        try:
+            written = backfill_scan_summaries()
+            if written:
+                logger.info("Backfilled scan summaries: %s", written)
+        except Exception:
+            logger.exception("Scan summary backfill failed")
+
+    thread = threading.Thread(target=_run, name="scan-summary-backfill", daemon=True)
+    thread.start()
+    return thread
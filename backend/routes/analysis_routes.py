@@ -6,23 +6,37 @@ Returns JSON only. No HTML templates.
 
 import json
 import threading
+import time
 import uuid
 
 from flask import Blueprint, g, jsonify, request, session
 
 from backend.modules.analysis import (
-    capture_screenshot,
+    capture_page,
     generate_screenshot_path,
     run_analysis_pipeline,
 )
 from backend.modules.brand import get_brand_profile_by_user
-from backend.modules.database import get_db_connection
+from backend.modules.codec import decode_json, encode_json
+from backend.modules.database import (
+    apply_scan_rollups,
+    apply_scan_state,
+    get_db_connection,
+    write_scan_summary,
+)
+from backend.modules.events import SCAN_SAVED, publish
+from backend.modules.job_store import get_job_store
 from backend.modules.logger import get_logger
+from backend.modules.report import compact_report, expand_report, report_item_counts
 from backend.modules.utils import is_valid_url
 
 analysis_bp = Blueprint("analysis_bp", __name__)
 logger = get_logger(__name__)
 
+# Streaming progress maps model output size onto the 55-90 band of the analyzing stage.
+EXPECTED_REPORT_BYTES = 6000
+STREAM_PROGRESS_INTERVAL_SEC = 1.0
+
 
 def _error(message, code, status):
     return (
@@ -61,6 +75,10 @@ def _parse_brand_category(brand_profile):
     return category
 
 
+def _parse_flag(value):
+    return str(value or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
 def _enrich_response_payload(payload):
     analysis = payload.get("analysis", {}) if isinstance(payload, dict) else {}
     payload["citation_authority"] = payload.get(
@@ -90,86 +108,52 @@ def _enrich_response_payload(payload):
 
 def _create_job(user_id, scan_context_id, est_duration_sec):
     job_id = uuid.uuid4().hex
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO analysis_jobs (
-            job_id, user_id, scan_context_id, est_duration_sec, status, stage_label, progress
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (job_id, user_id, scan_context_id, est_duration_sec, "queued", "Queued", 0),
-    )
-    conn.commit()
-    conn.close()
+    get_job_store().create(job_id, user_id, scan_context_id, est_duration_sec)
     return job_id
 
 
 def _update_job(job_id, **fields):
-    if not fields:
-        return
-
-    allowed = {
-        "status",
-        "stage_label",
-        "progress",
-        "screenshot_url",
-        "captured_at",
-        "dom_loaded_ms",
-        "overview_source_type",
-        "overview_fetch_mode",
-        "extraction_method",
-        "error",
-        "result_json",
-    }
+    # Buffered; completed/failed states are flushed to SQLite before returning.
+    get_job_store().update(job_id, **fields)
 
-    updates = []
-    values = []
-    for key, value in fields.items():
-        if key in allowed:
-            updates.append(f"{key} = ?")
-            values.append(value)
 
-    if not updates:
-        return
+def _get_job(job_id):
+    return get_job_store().get(job_id)
 
-    updates.append("updated_at = CURRENT_TIMESTAMP")
-    values.append(job_id)
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        f"UPDATE analysis_jobs SET {', '.join(updates)} WHERE job_id = ?",
-        values,
-    )
-    conn.commit()
-    conn.close()
 
+def _append_run_event(job_id, event_type, stage_label, details=None, scan_id=None):
+    get_job_store().append_event(job_id, event_type, stage_label, details, scan_id=scan_id)
 
-def _get_job(job_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM analysis_jobs WHERE job_id = ?", (job_id,))
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
 
+def _stream_progress(bytes_received):
+    return 55 + min(35, int(35 * (bytes_received or 0) / EXPECTED_REPORT_BYTES))
 
-def _append_run_event(job_id, event_type, stage_label, details=None, scan_id=None):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO scan_run_events (job_id, scan_id, event_type, stage_label, details_json)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (job_id, scan_id, event_type, stage_label, json.dumps(details or {})),
-    )
-    conn.commit()
-    conn.close()
 
+def _build_stream_progress_callback(job_id):
+    """
+    Persist streamed model progress, throttled to one write per interval unless a
+    new report section (scores, sentiment, ...) has just completed.
+    """
+    state = {"last_write": 0.0}
+
+    def _on_progress(update):
+        now = time.monotonic()
+        partial = update.get("partial")
+        if not partial and now - state["last_write"] < STREAM_PROGRESS_INTERVAL_SEC:
+            return
+        state["last_write"] = now
+        fields = {
+            "progress": _stream_progress(update.get("bytes_received")),
+            "stream_bytes": update.get("bytes_received"),
+        }
+        if partial:
+            fields["partial_result_json"] = json.dumps(partial)
+        _update_job(job_id, **fields)
 
-def _insert_metric_row(
-    cursor,
+    return _on_progress
+
+
+def _metric_row(
     scan_id,
     brand_profile_id,
     keyword,
@@ -178,25 +162,22 @@ def _insert_metric_row(
     platform,
     competitor_domain=None,
 ):
-    cursor.execute(
-        """
-        INSERT INTO scan_metrics (
-            scan_id, brand_profile_id, keyword, metric_key, metric_value, platform, competitor_domain
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            scan_id,
-            brand_profile_id,
-            keyword,
-            metric_key,
-            float(metric_value or 0),
-            platform,
-            competitor_domain,
-        ),
+    return (
+        scan_id,
+        brand_profile_id,
+        keyword,
+        metric_key,
+        float(metric_value or 0),
+        platform,
+        competitor_domain,
     )
 
 
 def _persist_scan_artifacts(cursor, scan_id, brand_profile_id, keyword, analysis_result):
+    """
+    Write metric, citation and prompt-observation rows in batches on the
+    caller's transaction. Returns the number of rows written per table.
+    """
     analysis = analysis_result.get("analysis", {})
     scores = analysis.get("scores", {}) if isinstance(analysis, dict) else {}
     visibility = scores.get("visibility", analysis.get("visibility", 0))
@@ -218,74 +199,22 @@ def _persist_scan_artifacts(cursor, scan_id, brand_profile_id, keyword, analysis
         citation_authority = 0.0
 
     platform = analysis_result.get("overview_source_type", "google")
-    _insert_metric_row(
-        cursor,
-        scan_id,
-        brand_profile_id,
-        keyword,
-        "visibility_score",
-        visibility,
-        platform,
-    )
-    _insert_metric_row(
-        cursor,
-        scan_id,
-        brand_profile_id,
-        keyword,
-        "content_score",
-        content,
-        platform,
-    )
-    _insert_metric_row(
-        cursor,
-        scan_id,
-        brand_profile_id,
-        keyword,
-        "technical_score",
-        technical,
-        platform,
-    )
-    _insert_metric_row(
-        cursor,
-        scan_id,
-        brand_profile_id,
-        keyword,
-        "visual_score",
-        visual,
-        platform,
-    )
-    _insert_metric_row(
-        cursor,
-        scan_id,
-        brand_profile_id,
-        keyword,
-        "share_of_voice",
-        visibility,
-        platform,
-    )
-    _insert_metric_row(
-        cursor,
-        scan_id,
-        brand_profile_id,
-        keyword,
-        "citation_authority",
-        citation_authority,
-        platform,
-    )
-    _insert_metric_row(
-        cursor,
-        scan_id,
-        brand_profile_id,
-        keyword,
-        "sentiment_score",
-        sentiment_score,
-        platform,
-    )
+    metric_rows = [
+        _metric_row(scan_id, brand_profile_id, keyword, metric_key, value, platform)
+        for metric_key, value in (
+            ("visibility_score", visibility),
+            ("content_score", content),
+            ("technical_score", technical),
+            ("visual_score", visual),
+            ("share_of_voice", visibility),
+            ("citation_authority", citation_authority),
+            ("sentiment_score", sentiment_score),
+        )
+    ]
 
     competitor_domains = analysis_result.get("competitor_domains", [])
-    for domain in competitor_domains:
-        _insert_metric_row(
-            cursor,
+    metric_rows.extend(
+        _metric_row(
             scan_id,
             brand_profile_id,
             keyword,
@@ -294,25 +223,38 @@ def _persist_scan_artifacts(cursor, scan_id, brand_profile_id, keyword, analysis
             platform,
             competitor_domain=domain,
         )
+        for domain in competitor_domains
+    )
+    cursor.executemany(
+        """
+        INSERT INTO scan_metrics (
+            scan_id, brand_profile_id, keyword, metric_key, metric_value, platform, competitor_domain
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        metric_rows,
+    )
 
-    for citation in analysis_result.get("citations", []):
-        if not isinstance(citation, dict):
-            continue
-        cursor.execute(
+    citation_rows = [
+        (
+            scan_id,
+            brand_profile_id,
+            keyword,
+            citation.get("domain"),
+            citation.get("url"),
+            citation.get("position"),
+            platform,
+        )
+        for citation in analysis_result.get("citations", [])
+        if isinstance(citation, dict)
+    ]
+    if citation_rows:
+        cursor.executemany(
             """
             INSERT INTO scan_citations (
                 scan_id, brand_profile_id, keyword, citation_domain, citation_url, position, source_model
             ) VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                scan_id,
-                brand_profile_id,
-                keyword,
-                citation.get("domain"),
-                citation.get("url"),
-                citation.get("position"),
-                platform,
-            ),
+            citation_rows,
         )
 
     brand_mentioned = 1 if float(visibility or 0) > 0 else 0
@@ -334,6 +276,15 @@ def _persist_scan_artifacts(cursor, scan_id, brand_profile_id, keyword, analysis
         ),
     )
 
+    return {
+        "scan_metrics": len(metric_rows),
+        "scan_citations": len(citation_rows),
+        "prompt_observations": 1,
+        "competitor_domains": len(
+            {domain for domain in competitor_domains if domain is not None and str(domain).strip()}
+        ),
+    }
+
 
 def save_scan_result(brand_profile_id, keyword, analysis_result, screenshot_url=None):
     """
@@ -343,8 +294,10 @@ def save_scan_result(brand_profile_id, keyword, analysis_result, screenshot_url=
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        breakdown_json = json.dumps(analysis_result.get("analysis", {}))
-        raw_report_json = json.dumps(analysis_result)
+        # One canonical copy per scan: analysis lives inside the compact report, so
+        # breakdown_json is only populated on rows written before the compact format.
+        breakdown_json = None
+        raw_report_json = encode_json(compact_report(analysis_result))
 
         cursor.execute(
             """
@@ -368,8 +321,23 @@ def save_scan_result(brand_profile_id, keyword, analysis_result, screenshot_url=
             ),
         )
         scan_id = cursor.lastrowid
-        _persist_scan_artifacts(cursor, scan_id, brand_profile_id, keyword, analysis_result)
+        artifact_counts = _persist_scan_artifacts(
+            cursor, scan_id, brand_profile_id, keyword, analysis_result
+        )
+        write_scan_summary(
+            cursor,
+            scan_id,
+            {
+                **artifact_counts,
+                **report_item_counts(analysis_result),
+                "raw_report_present": bool(raw_report_json),
+                "breakdown_present": bool(analysis_result.get("analysis")),
+            },
+        )
+        apply_scan_rollups(cursor, scan_id)
+        apply_scan_state(cursor, scan_id)
         conn.commit()
+        publish(SCAN_SAVED, brand_profile_id=brand_profile_id, scan_id=scan_id)
         return scan_id
     except Exception:
         logger.exception("Error saving scan result")
@@ -418,8 +386,12 @@ def run_analysis():
         "brand_category": brand_category,
     }
 
+    bypass_cache = _parse_flag(data.get("bypass_cache"))
+
     try:
-        analysis_result = run_analysis_pipeline(keyword, url, brand_context=brand_context)
+        analysis_result = run_analysis_pipeline(
+            keyword, url, brand_context=brand_context, bypass_cache=bypass_cache
+        )
         analysis_result["competitor_domains"] = competitor_domains
         analysis_result = _enrich_response_payload(analysis_result)
 
@@ -477,6 +449,7 @@ def run_analysis_async():
         "brand_category": brand_category,
     }
 
+    bypass_cache = _parse_flag(data.get("bypass_cache"))
     screenshot_path, screenshot_url = generate_screenshot_path()
     scan_context_id = uuid.uuid4().hex
     est_duration_sec = 45
@@ -495,8 +468,9 @@ def run_analysis_async():
             progress=10,
         )
         _append_run_event(job_id, "capturing_screenshot", "Capturing page snapshot")
-        shot_result = capture_screenshot(url, screenshot_path)
-        if shot_result.get("success"):
+        # One navigation yields both the snapshot and the HTML the pipeline analyzes.
+        page_capture = capture_page(url, screenshot_path)
+        if page_capture.get("screenshot_captured"):
             persisted_screenshot_url = screenshot_url
             _update_job(
                 job_id,
@@ -504,8 +478,8 @@ def run_analysis_async():
                 stage_label="Snapshot captured",
                 progress=30,
                 screenshot_url=screenshot_url,
-                captured_at=shot_result.get("captured_at"),
-                dom_loaded_ms=shot_result.get("dom_loaded_ms"),
+                captured_at=page_capture.get("captured_at"),
+                dom_loaded_ms=page_capture.get("dom_loaded_ms"),
             )
             _append_run_event(
                 job_id,
@@ -513,8 +487,8 @@ def run_analysis_async():
                 "Snapshot captured",
                 {
                     "screenshot_url": screenshot_url,
-                    "captured_at": shot_result.get("captured_at"),
-                    "dom_loaded_ms": shot_result.get("dom_loaded_ms"),
+                    "captured_at": page_capture.get("captured_at"),
+                    "dom_loaded_ms": page_capture.get("dom_loaded_ms"),
                 },
             )
         else:
@@ -530,7 +504,14 @@ def run_analysis_async():
         _append_run_event(job_id, "analyzing", "Running strategic audit")
 
         try:
-            analysis_result = run_analysis_pipeline(keyword, url, brand_context=brand_context)
+            analysis_result = run_analysis_pipeline(
+                keyword,
+                url,
+                brand_context=brand_context,
+                page_capture=page_capture,
+                bypass_cache=bypass_cache,
+                ai_progress_callback=_build_stream_progress_callback(job_id),
+            )
             analysis_result["competitor_domains"] = competitor_domains
             analysis_result = _enrich_response_payload(analysis_result)
             scan_id = save_scan_result(
@@ -552,7 +533,7 @@ def run_analysis_async():
                 overview_source_type=analysis_result.get("overview_source_type"),
                 overview_fetch_mode=analysis_result.get("overview_fetch_mode"),
                 extraction_method=analysis_result.get("extraction_method"),
-                result_json=json.dumps(analysis_result),
+                result_json=encode_json(compact_report(analysis_result)),
             )
             _append_run_event(
                 job_id,
@@ -615,13 +596,21 @@ def analysis_status(job_id):
         "overview_source_type": job.get("overview_source_type"),
         "overview_fetch_mode": job.get("overview_fetch_mode"),
         "extraction_method": job.get("extraction_method"),
+        "stream_bytes": job.get("stream_bytes"),
         "error": job.get("error"),
     }
 
+    # Sections parsed from the streamed model output before the full report is ready.
+    if job.get("status") == "analyzing" and job.get("partial_result_json"):
+        try:
+            response["partial_result"] = json.loads(job["partial_result_json"])
+        except Exception:
+            response["partial_result"] = None
+
     if job.get("status") == "completed":
         result_json = job.get("result_json")
         try:
-            response["result"] = json.loads(result_json) if result_json else None
+            response["result"] = expand_report(decode_json(result_json))
         except Exception:
             response["result"] = None
 
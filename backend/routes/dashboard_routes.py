@@ -5,13 +5,20 @@ Flask blueprint for dashboard and history endpoints.
 Returns JSON only. No HTML templates.
 """
 
+import base64
+import hashlib
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from io import BytesIO
 
-from flask import Blueprint, jsonify, session, g, send_file
-from backend.modules.database import get_db_connection
+from flask import Blueprint, Response, jsonify, request, session, g, send_file
+from backend.modules.cache import build_cache
+from backend.modules.codec import decode_json
+from backend.modules.database import SCAN_SUMMARY_FIELDS, get_db_connection
+from backend.modules.events import BRAND_PROFILE_CREATED, SCAN_SAVED, subscribe
+from backend.modules.report import expand_report
+from backend.modules.summaries import build_scan_summary
 
 try:
     from reportlab.lib import colors
@@ -28,6 +35,20 @@ except Exception:  # pragma: no cover - optional at runtime
 
 dashboard_bp = Blueprint("dashboard_bp", __name__)
 
+SCAN_HISTORY_PAGE_SIZE = int(os.environ.get("SCAN_HISTORY_PAGE_SIZE", "20"))
+SCAN_HISTORY_MAX_PAGE_SIZE = int(os.environ.get("SCAN_HISTORY_MAX_PAGE_SIZE", "100"))
+
+# Process-local cache of dashboard query results, keyed by (user, brand, ETag).
+# The ETag already covers the brand's data version, the query params and (for
+# windowed endpoints) the UTC day; writes also drop a brand's entries eagerly.
+DASHBOARD_CACHE = build_cache(
+    "dashboard",
+    backend=os.environ.get("DASHBOARD_CACHE_BACKEND", "memory"),
+    max_entries=int(os.environ.get("DASHBOARD_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.environ.get("DASHBOARD_CACHE_TTL_SEC", "300")),
+)
+_CACHE_MISS = object()
+
 
 def _error(message, code, status):
     return (
@@ -63,23 +84,251 @@ def _require_user():
     return int(user_id), None
 
 
-def _latest_brand_profile_id(user_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
+def _latest_brand_profile_id(user_id, cursor=None):
+    conn = get_db_connection() if cursor is None else None
+    if conn is not None:
+        cursor = conn.cursor()
     cursor.execute(
         "SELECT id FROM brand_profiles WHERE user_id = ? ORDER BY created_at DESC LIMIT 1",
         (user_id,),
     )
     row = cursor.fetchone()
-    conn.close()
+    if conn is not None:
+        conn.close()
     return row["id"] if row else None
 
 
+def _dashboard_validators(name, brand_profile_id, *parts, daily=False, cursor=None):
+    """
+    Weak ETag and Last-Modified for a brand-scoped dashboard response, derived from
+    brand_scan_state.data_version. `daily` responses (rolling windows) also change
+    at each UTC midnight, so the day is part of the tag.
+    """
+    conn = get_db_connection() if cursor is None else None
+    if conn is not None:
+        cursor = conn.cursor()
+    cursor.execute(
+        "SELECT data_version, data_updated_at FROM brand_scan_state WHERE brand_profile_id = ?",
+        (brand_profile_id,),
+    )
+    row = cursor.fetchone()
+    if conn is not None:
+        conn.close()
+
+    version = int(row["data_version"] or 0) if row else 0
+    last_modified = None
+    if row and row["data_updated_at"]:
+        last_modified = datetime.strptime(row["data_updated_at"], "%Y-%m-%d %H:%M:%S").replace(
+            tzinfo=timezone.utc
+        )
+    tag_parts = [name, brand_profile_id, version, *parts]
+    if daily:
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        tag_parts.append(today.strftime("%Y-%m-%d"))
+        last_modified = max(last_modified, today) if last_modified else today
+    etag = hashlib.sha1("|".join(str(part) for part in tag_parts).encode("utf-8")).hexdigest()
+    return etag[:24], last_modified
+
+
+def _cached_query(user_id, brand_profile_id, etag, query, *args, cursor=None):
+    """
+    Return `query(cursor, *args)`, reusing a cached result for the same ETag.
+    Opens a connection only on a miss when no cursor is passed.
+    """
+    key = (user_id, brand_profile_id, etag)
+    if DASHBOARD_CACHE is not None:
+        cached = DASHBOARD_CACHE.get(key, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return cached
+
+    if cursor is not None:
+        result = query(cursor, *args)
+    else:
+        conn = get_db_connection()
+        try:
+            result = query(conn.cursor(), *args)
+        finally:
+            conn.close()
+    if DASHBOARD_CACHE is not None:
+        DASHBOARD_CACHE.set(key, result)
+    return result
+
+
+def _invalidate_dashboard_cache(predicate):
+    delete_where = getattr(DASHBOARD_CACHE, "delete_where", None)
+    return delete_where(predicate) if delete_where is not None else 0
+
+
+def _on_scan_saved(brand_profile_id, scan_id=None):
+    _invalidate_dashboard_cache(lambda key: key[1] == brand_profile_id)
+
+
+def _on_brand_profile_created(user_id, brand_profile_id=None):
+    # The user's dashboards now read the new profile; entries for older ones are dead.
+    _invalidate_dashboard_cache(lambda key: key[0] == int(user_id))
+
+
+subscribe(SCAN_SAVED, _on_scan_saved)
+subscribe(BRAND_PROFILE_CREATED, _on_brand_profile_created)
+
+
+def dashboard_cache_stats():
+    return DASHBOARD_CACHE.stats() if DASHBOARD_CACHE is not None else None
+
+
+def _settled(last_modified):
+    """
+    True once the Last-Modified second is over. HTTP dates have one-second
+    precision, so a stamp from the current second could hide a later write.
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return last_modified is not None and last_modified < now
+
+
+def _with_validators(response, etag, last_modified):
+    response.set_etag(etag, weak=True)
+    if _settled(last_modified):
+        response.last_modified = last_modified
+    # Browsers may store the body but must revalidate before reusing it.
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _not_modified(etag, last_modified):
+    """
+    304 response when the client's validators still match, else None.
+    The ETag (data_version) is authoritative; If-Modified-Since is only consulted
+    without If-None-Match, and a match within the current second counts as modified.
+    """
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        matched = bool(
+            since and _settled(last_modified) and _settled(since) and last_modified <= since
+        )
+    if not matched:
+        return None
+    return _with_validators(Response(status=304), etag, last_modified)
+
+
+def _encode_history_cursor(timestamp, scan_id):
+    payload = json.dumps([timestamp, scan_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def _decode_history_cursor(cursor_value):
+    """
+    Return (timestamp, scan_id) from an opaque history cursor; ValueError if malformed.
+    """
+    try:
+        padded = cursor_value + "=" * (-len(cursor_value) % 4)
+        timestamp, scan_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(timestamp, str) or not isinstance(scan_id, int):
+        raise ValueError("Invalid cursor")
+    return timestamp, scan_id
+
+
+def _parse_day(value):
+    return datetime.strptime(value.strip(), "%Y-%m-%d")
+
+
+def _scan_history_filters(args):
+    """
+    Build (where clauses, params) for the optional history filters; ValueError on bad input.
+    """
+    clauses = []
+    params = []
+    keyword = (args.get("keyword") or "").strip()
+    if keyword:
+        escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append("keyword LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+    for name, operator in (("min_score", ">="), ("max_score", "<=")):
+        value = args.get(name)
+        if value not in (None, ""):
+            try:
+                params.append(float(value))
+            except ValueError as exc:
+                raise ValueError(f"Invalid {name}") from exc
+            clauses.append(f"las_score {operator} ?")
+    for name, operator, offset_days in (("from", ">=", 0), ("to", "<", 1)):
+        value = args.get(name)
+        if value:
+            try:
+                day = _parse_day(value) + timedelta(days=offset_days)
+            except ValueError as exc:
+                raise ValueError(f"Invalid {name} date (expected YYYY-MM-DD)") from exc
+            clauses.append(f"timestamp {operator} ?")
+            params.append(day.strftime("%Y-%m-%d %H:%M:%S"))
+    return clauses, params
+
+
+def _scan_history_item(scan):
+    return {
+        "scan_id": scan["id"],
+        "keyword": scan["keyword"],
+        "timestamp": scan["timestamp"],
+        "las_score": scan["las_score"],
+        "trust_score": scan["trust_score"],
+        "citation_authority": scan["trust_score"],
+        "screenshot_url": scan["screenshot_url"],
+        "overview_source_type": scan["overview_source_type"],
+        "overview_fetch_mode": scan["overview_fetch_mode"],
+        "extraction_method": scan["extraction_method"],
+    }
+
+
+def _query_scan_history(cursor, brand_profile_id, limit, clauses=(), params=(), total=False):
+    """
+    One history page, newest first. `total` adds the brand's scan count from
+    brand_scan_state (pass False for filtered pages).
+    """
+    where = "".join(f" AND {clause}" for clause in clauses)
+    # One extra row tells us whether another page exists.
+    cursor.execute(
+        f"""
+        SELECT id, keyword, timestamp, las_score, trust_score,
+               screenshot_url, overview_source_type, overview_fetch_mode, extraction_method
+        FROM scan_results
+        WHERE brand_profile_id = ?{where}
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+        """,
+        [brand_profile_id] + list(params) + [limit + 1],
+    )
+    scans = cursor.fetchall()
+    total_count = None
+    if total:
+        cursor.execute(
+            "SELECT scan_count FROM brand_scan_state WHERE brand_profile_id = ?",
+            (brand_profile_id,),
+        )
+        row = cursor.fetchone()
+        total_count = int(row["scan_count"]) if row else 0
+
+    has_more = len(scans) > limit
+    scans = scans[:limit]
+    return {
+        "total_scans": len(scans),
+        "total_count": total_count,
+        "has_more": has_more,
+        "next_cursor": (
+            _encode_history_cursor(scans[-1]["timestamp"], scans[-1]["id"]) if has_more else None
+        ),
+        "scans": [_scan_history_item(scan) for scan in scans],
+    }
+
+
 @dashboard_bp.route("/api/dashboard/scan-history/<int:user_id>", methods=["GET"])
 def get_scan_history(user_id):
     """
-    Get scan history for a user.
-    Returns list of recent scans with basic info.
+    Get scan history for a user, newest first.
+    Keyset-paginated on (timestamp, id): pass `next_cursor` back as `cursor`.
+    Optional filters: keyword, min_score, max_score, from, to (YYYY-MM-DD, inclusive).
+    `include_total=1` adds the brand's scan count from brand_scan_state (unfiltered only).
     """
     session_user_id, err = _require_user()
     if err:
@@ -87,50 +336,39 @@ def get_scan_history(user_id):
     if int(session_user_id) != int(user_id):
         return _error("Forbidden", "forbidden", 403)
 
+    try:
+        limit = int(request.args.get("limit") or SCAN_HISTORY_PAGE_SIZE)
+    except ValueError:
+        return _error("Invalid limit", "validation_error", 400)
+    limit = max(1, min(limit, SCAN_HISTORY_MAX_PAGE_SIZE))
+    try:
+        clauses, params = _scan_history_filters(request.args)
+        filtered = bool(clauses)
+        cursor_value = request.args.get("cursor")
+        if cursor_value:
+            cursor_timestamp, cursor_scan_id = _decode_history_cursor(cursor_value)
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend([cursor_timestamp, cursor_scan_id])
+    except ValueError as exc:
+        return _error(str(exc), "validation_error", 400)
+    include_total = (request.args.get("include_total") or "").lower() in ("1", "true", "yes")
+
     brand_profile_id = _latest_brand_profile_id(user_id)
     if not brand_profile_id:
         return _error("No brand profile found for this user", "not_found", 404)
 
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT id, keyword, timestamp, las_score, trust_score,
-               screenshot_url, overview_source_type, overview_fetch_mode, extraction_method
-        FROM scan_results
-        WHERE brand_profile_id = ?
-        ORDER BY timestamp DESC
-        LIMIT 20
-        """,
-        (brand_profile_id,),
+    history = _query_scan_history(
+        conn.cursor(),
+        brand_profile_id,
+        limit,
+        clauses,
+        params,
+        total=include_total and not filtered,
     )
-    scans = cursor.fetchall()
     conn.close()
 
-    scan_list = []
-    for scan in scans:
-        scan_list.append(
-            {
-                "scan_id": scan["id"],
-                "keyword": scan["keyword"],
-                "timestamp": scan["timestamp"],
-                "las_score": scan["las_score"],
-                "trust_score": scan["trust_score"],
-                "citation_authority": scan["trust_score"],
-                "screenshot_url": scan["screenshot_url"],
-                "overview_source_type": scan["overview_source_type"],
-                "overview_fetch_mode": scan["overview_fetch_mode"],
-                "extraction_method": scan["extraction_method"],
-            }
-        )
-
-    return jsonify(
-        {
-            "success": True,
-            "total_scans": len(scan_list),
-            "scans": scan_list,
-        }
-    )
+    return jsonify({"success": True, **history})
 
 
 @dashboard_bp.route("/api/dashboard/scan-result/<int:scan_id>", methods=["GET"])
@@ -161,8 +399,10 @@ def get_scan_result(scan_id):
     if not scan:
         return _error("Scan result not found", "not_found", 404)
 
-    breakdown = json.loads(scan["breakdown_json"]) if scan["breakdown_json"] else {}
-    raw_report = json.loads(scan["raw_report_json"]) if scan["raw_report_json"] else {}
+    raw_report = expand_report(decode_json(scan["raw_report_json"], {}))
+    breakdown = decode_json(scan["breakdown_json"], None)
+    if breakdown is None:
+        breakdown = raw_report.get("analysis", {}) if isinstance(raw_report, dict) else {}
 
     return jsonify(
         {
@@ -185,6 +425,28 @@ def get_scan_result(scan_id):
     )
 
 
+def _query_stats(cursor, brand_profile_id):
+    cursor.execute(
+        """
+        SELECT COUNT(*) as total_scans,
+               AVG(las_score) as avg_las,
+               AVG(trust_score) as avg_trust,
+               MAX(timestamp) as last_scan
+        FROM scan_results
+        WHERE brand_profile_id = ?
+        """,
+        (brand_profile_id,),
+    )
+    stats = cursor.fetchone()
+    return {
+        "total_scans": stats["total_scans"] or 0,
+        "avg_las_score": round(float(stats["avg_las"] or 0), 2),
+        "avg_trust_score": round(float(stats["avg_trust"] or 0), 2),
+        "avg_citation_authority": round(float(stats["avg_trust"] or 0), 2),
+        "last_scan": stats["last_scan"],
+    }
+
+
 @dashboard_bp.route("/api/dashboard/stats/<int:user_id>", methods=["GET"])
 def get_user_stats(user_id):
     """
@@ -201,34 +463,78 @@ def get_user_stats(user_id):
     if not brand_profile_id:
         return _error("No brand profile found for this user", "not_found", 404)
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT COUNT(*) as total_scans,
-               AVG(las_score) as avg_las,
-               AVG(trust_score) as avg_trust,
-               MAX(timestamp) as last_scan
-        FROM scan_results
-        WHERE brand_profile_id = ?
-        """,
-        (brand_profile_id,),
-    )
-    stats = cursor.fetchone()
-    conn.close()
+    etag, last_modified = _dashboard_validators("stats", brand_profile_id)
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
 
-    return jsonify(
+    stats = _cached_query(user_id, brand_profile_id, etag, _query_stats, brand_profile_id)
+
+    response = jsonify(
         {
             "success": True,
-            "stats": {
-                "total_scans": stats["total_scans"] or 0,
-                "avg_las_score": round(float(stats["avg_las"] or 0), 2),
-                "avg_trust_score": round(float(stats["avg_trust"] or 0), 2),
-                "avg_citation_authority": round(float(stats["avg_trust"] or 0), 2),
-                "last_scan": stats["last_scan"],
-            },
+            "stats": stats,
         }
     )
+    return _with_validators(response, etag, last_modified)
+
+
+def _query_insights(cursor, brand_profile_id):
+    """
+    Artifact summary for the brand's latest scan, or None when it has no scans.
+    Counts come from the scan's scan_summaries row (one primary-key join).
+    """
+    cursor.execute(
+        f"""
+        SELECT sr.id, sr.keyword, sr.timestamp, sr.screenshot_url, sr.overview_source_type,
+               sr.overview_fetch_mode, sr.overview_confidence, sr.extraction_method,
+               ss.scan_id AS summary_scan_id,
+               {", ".join(f"ss.{field}" for field in SCAN_SUMMARY_FIELDS)}
+        FROM scan_results sr
+        LEFT JOIN scan_summaries ss ON ss.scan_id = sr.id
+        WHERE sr.brand_profile_id = ?
+        ORDER BY sr.timestamp DESC, sr.id DESC
+        LIMIT 1
+        """,
+        (brand_profile_id,),
+    )
+    latest_scan = cursor.fetchone()
+    if not latest_scan:
+        return None
+
+    scan_id = latest_scan["id"]
+    if latest_scan["summary_scan_id"] is None:
+        # Saved before scan_summaries existed and not yet reached by the startup
+        # backfill: compute without storing, so a GET never takes the write lock.
+        summary = build_scan_summary(cursor, scan_id)
+    else:
+        summary = {field: latest_scan[field] for field in SCAN_SUMMARY_FIELDS}
+
+    return {
+        "scan_id": scan_id,
+        "keyword": latest_scan["keyword"],
+        "timestamp": latest_scan["timestamp"],
+        "screenshot_captured": bool(latest_scan["screenshot_url"]),
+        "overview_source_type": latest_scan["overview_source_type"],
+        "overview_fetch_mode": latest_scan["overview_fetch_mode"],
+        "overview_confidence": latest_scan["overview_confidence"],
+        "extraction_method": latest_scan["extraction_method"],
+        "stored_records": {
+            "scan_metrics": summary["scan_metrics"],
+            "scan_citations": summary["scan_citations"],
+            "prompt_observations": summary["prompt_observations"],
+            "scan_run_events": summary["scan_run_events"],
+            "competitor_domains": summary["competitor_domains"],
+        },
+        "analysis_artifacts": {
+            "action_plan_items": summary["action_plan_items"],
+            "technical_audit_items": summary["technical_audit_items"],
+            "diagnostics_items": summary["diagnostics_items"],
+            "executive_summary_items": summary["executive_summary_items"],
+        },
+        "raw_report_present": bool(summary["raw_report_present"]),
+        "breakdown_present": bool(summary["breakdown_present"]),
+    }
 
 
 @dashboard_bp.route("/api/dashboard/insights/<int:user_id>", methods=["GET"])
@@ -246,106 +552,47 @@ def get_dashboard_insights(user_id):
     if not brand_profile_id:
         return _error("No brand profile found for this user", "not_found", 404)
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT id, keyword, timestamp, screenshot_url, overview_source_type,
-               overview_fetch_mode, overview_confidence, extraction_method,
-               raw_report_json, breakdown_json
-        FROM scan_results
-        WHERE brand_profile_id = ?
-        ORDER BY timestamp DESC
-        LIMIT 1
-        """,
-        (brand_profile_id,),
-    )
-    latest_scan = cursor.fetchone()
+    etag, last_modified = _dashboard_validators("insights", brand_profile_id)
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
 
-    if not latest_scan:
-        conn.close()
-        return jsonify({"success": True, "insights": None})
+    insights = _cached_query(user_id, brand_profile_id, etag, _query_insights, brand_profile_id)
 
-    scan_id = latest_scan["id"]
-    cursor.execute(
-        "SELECT COUNT(*) AS total FROM scan_citations WHERE scan_id = ?",
-        (scan_id,),
-    )
-    citation_total = int((cursor.fetchone() or {"total": 0})["total"] or 0)
+    response = jsonify({"success": True, "insights": insights})
+    return _with_validators(response, etag, last_modified)
 
-    cursor.execute(
-        "SELECT COUNT(*) AS total FROM prompt_observations WHERE scan_id = ?",
-        (scan_id,),
-    )
-    prompt_total = int((cursor.fetchone() or {"total": 0})["total"] or 0)
 
-    cursor.execute(
-        "SELECT COUNT(*) AS total FROM scan_run_events WHERE scan_id = ?",
-        (scan_id,),
-    )
-    event_total = int((cursor.fetchone() or {"total": 0})["total"] or 0)
+def _window_start_day(days):
+    return (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-    cursor.execute(
-        "SELECT COUNT(*) AS total FROM scan_metrics WHERE scan_id = ?",
-        (scan_id,),
-    )
-    metric_total = int((cursor.fetchone() or {"total": 0})["total"] or 0)
 
+def _query_trend_series(cursor, brand_profile_id, metrics, start_day):
+    """
+    Daily points per metric from the rollups (maintained by save_scan_result),
+    read for all requested metrics in one query.
+    """
+    series = {metric: [] for metric in metrics}
+    if not series:
+        return series
+    placeholders = ", ".join("?" for _ in series)
     cursor.execute(
-        """
-        SELECT COUNT(DISTINCT competitor_domain) AS total
-        FROM scan_metrics
-        WHERE scan_id = ? AND competitor_domain IS NOT NULL AND TRIM(competitor_domain) != ''
+        f"""
+        SELECT metric_key, day AS recorded_at, value_sum / value_count AS value
+        FROM metric_daily_rollups
+        WHERE brand_profile_id = ?
+          AND metric_key IN ({placeholders})
+          AND day >= ?
+          AND value_count > 0
+        ORDER BY metric_key, day ASC
         """,
-        (scan_id,),
-    )
-    competitor_domain_total = int((cursor.fetchone() or {"total": 0})["total"] or 0)
-    conn.close()
-
-    report = json.loads(latest_scan["raw_report_json"]) if latest_scan["raw_report_json"] else {}
-    analysis = report.get("analysis", {}) if isinstance(report, dict) else {}
-
-    action_plan = analysis.get("action_plan", []) if isinstance(analysis, dict) else []
-    if not isinstance(action_plan, list) or not action_plan:
-        action_plan = analysis.get("actions", []) if isinstance(analysis, dict) else []
-    technical_audit = analysis.get("technical_audit", []) if isinstance(analysis, dict) else []
-    diagnostics = analysis.get("diagnostics", []) if isinstance(analysis, dict) else []
-    executive_summary = analysis.get("executive_summary", []) if isinstance(analysis, dict) else []
-
-    return jsonify(
-        {
-            "success": True,
-            "insights": {
-                "scan_id": scan_id,
-                "keyword": latest_scan["keyword"],
-                "timestamp": latest_scan["timestamp"],
-                "screenshot_captured": bool(latest_scan["screenshot_url"]),
-                "overview_source_type": latest_scan["overview_source_type"],
-                "overview_fetch_mode": latest_scan["overview_fetch_mode"],
-                "overview_confidence": latest_scan["overview_confidence"],
-                "extraction_method": latest_scan["extraction_method"],
-                "stored_records": {
-                    "scan_metrics": metric_total,
-                    "scan_citations": citation_total,
-                    "prompt_observations": prompt_total,
-                    "scan_run_events": event_total,
-                    "competitor_domains": competitor_domain_total,
-                },
-                "analysis_artifacts": {
-                    "action_plan_items": len(action_plan) if isinstance(action_plan, list) else 0,
-                    "technical_audit_items": len(technical_audit)
-                    if isinstance(technical_audit, list)
-                    else 0,
-                    "diagnostics_items": len(diagnostics) if isinstance(diagnostics, list) else 0,
-                    "executive_summary_items": len(executive_summary)
-                    if isinstance(executive_summary, list)
-                    else 0,
-                },
-                "raw_report_present": bool(latest_scan["raw_report_json"]),
-                "breakdown_present": bool(latest_scan["breakdown_json"]),
-            },
-        }
+        [brand_profile_id] + list(series) + [start_day],
     )
+    for row in cursor.fetchall():
+        series[row["metric_key"]].append(
+            {"recorded_at": row["recorded_at"], "value": round(float(row["value"] or 0), 3)}
+        )
+    return series
 
 
 @dashboard_bp.route("/api/dashboard/trends/<int:user_id>", methods=["GET"])
@@ -356,8 +603,6 @@ def get_trends(user_id):
     - metric: metric_key (default: share_of_voice)
     - window: 7d|14d|30d|60d|90d (default: 30d)
     """
-    from flask import request
-
     session_user_id, err = _require_user()
     if err:
         return err
@@ -366,60 +611,35 @@ def get_trends(user_id):
 
     metric = (request.args.get("metric") or "share_of_voice").strip()
     window = request.args.get("window") or "30d"
-    days = _parse_window_days(window)
-    start_time = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+    start_day = _window_start_day(_parse_window_days(window))
 
     brand_profile_id = _latest_brand_profile_id(user_id)
     if not brand_profile_id:
         return _error("No brand profile found for this user", "not_found", 404)
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT recorded_at, AVG(metric_value) as value
-        FROM scan_metrics
-        WHERE brand_profile_id = ?
-          AND metric_key = ?
-          AND recorded_at >= ?
-        GROUP BY recorded_at
-        ORDER BY recorded_at ASC
-        """,
-        (brand_profile_id, metric, start_time),
+    etag, last_modified = _dashboard_validators(
+        "trends", brand_profile_id, metric, window, daily=True
     )
-    points = cursor.fetchall()
-    conn.close()
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
 
-    return jsonify(
+    points = _cached_query(
+        user_id, brand_profile_id, etag, _query_trend_series, brand_profile_id, [metric], start_day
+    )[metric]
+
+    response = jsonify(
         {
             "success": True,
             "metric": metric,
             "window": window,
-            "points": [
-                {"recorded_at": p["recorded_at"], "value": round(float(p["value"] or 0), 3)}
-                for p in points
-            ],
+            "points": points,
         }
     )
+    return _with_validators(response, etag, last_modified)
 
 
-@dashboard_bp.route("/api/dashboard/pillar-averages/<int:user_id>", methods=["GET"])
-def get_pillar_averages(user_id):
-    """
-    Return averaged pillar scores across all scans for the user's latest brand profile.
-    """
-    session_user_id, err = _require_user()
-    if err:
-        return err
-    if int(session_user_id) != int(user_id):
-        return _error("Forbidden", "forbidden", 403)
-
-    brand_profile_id = _latest_brand_profile_id(user_id)
-    if not brand_profile_id:
-        return _error("No brand profile found for this user", "not_found", 404)
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
+def _query_pillar_averages(cursor, brand_profile_id):
     cursor.execute(
         """
         SELECT metric_key, AVG(metric_value) AS avg_value
@@ -431,7 +651,6 @@ def get_pillar_averages(user_id):
         (brand_profile_id,),
     )
     rows = cursor.fetchall()
-    conn.close()
 
     averages = {
         "visibility": 0.0,
@@ -449,54 +668,56 @@ def get_pillar_averages(user_id):
         key = mapping.get(row["metric_key"])
         if key:
             averages[key] = round(float(row["avg_value"] or 0), 2)
-
-    return jsonify(
-        {
-            "success": True,
-            "pillar_averages": averages,
-        }
-    )
+    return averages
 
 
-@dashboard_bp.route("/api/dashboard/citations/<int:user_id>", methods=["GET"])
-def get_citations(user_id):
+@dashboard_bp.route("/api/dashboard/pillar-averages/<int:user_id>", methods=["GET"])
+def get_pillar_averages(user_id):
     """
-    Get citation authority/share by domain over a time window.
-    Query params:
-    - window: 7d|14d|30d|60d|90d (default: 30d)
+    Return averaged pillar scores across all scans for the user's latest brand profile.
     """
-    from flask import request
-
     session_user_id, err = _require_user()
     if err:
         return err
     if int(session_user_id) != int(user_id):
         return _error("Forbidden", "forbidden", 403)
 
-    window = request.args.get("window") or "30d"
-    days = _parse_window_days(window)
-    start_time = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
-
     brand_profile_id = _latest_brand_profile_id(user_id)
     if not brand_profile_id:
         return _error("No brand profile found for this user", "not_found", 404)
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    etag, last_modified = _dashboard_validators("pillar-averages", brand_profile_id)
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    averages = _cached_query(
+        user_id, brand_profile_id, etag, _query_pillar_averages, brand_profile_id
+    )
+
+    response = jsonify(
+        {
+            "success": True,
+            "pillar_averages": averages,
+        }
+    )
+    return _with_validators(response, etag, last_modified)
+
+
+def _query_citation_share(cursor, brand_profile_id, start_day):
     cursor.execute(
         """
-        SELECT citation_domain, COUNT(*) as mentions
-        FROM scan_citations
+        SELECT NULLIF(citation_domain, '') AS citation_domain, SUM(mentions) AS mentions
+        FROM citation_daily_rollups
         WHERE brand_profile_id = ?
-          AND recorded_at >= ?
+          AND day >= ?
         GROUP BY citation_domain
         ORDER BY mentions DESC
         LIMIT 50
         """,
-        (brand_profile_id, start_time),
+        (brand_profile_id, start_day),
     )
     rows = cursor.fetchall()
-    conn.close()
 
     total = sum((r["mentions"] or 0) for r in rows) or 1
     domains = []
@@ -509,14 +730,147 @@ def get_citations(user_id):
                 "share_pct": round((mentions / total) * 100.0, 2),
             }
         )
+    return domains
 
-    return jsonify(
+
+@dashboard_bp.route("/api/dashboard/citations/<int:user_id>", methods=["GET"])
+def get_citations(user_id):
+    """
+    Get citation authority/share by domain over a time window.
+    Query params:
+    - window: 7d|14d|30d|60d|90d (default: 30d)
+    """
+    session_user_id, err = _require_user()
+    if err:
+        return err
+    if int(session_user_id) != int(user_id):
+        return _error("Forbidden", "forbidden", 403)
+
+    window = request.args.get("window") or "30d"
+    start_day = _window_start_day(_parse_window_days(window))
+
+    brand_profile_id = _latest_brand_profile_id(user_id)
+    if not brand_profile_id:
+        return _error("No brand profile found for this user", "not_found", 404)
+
+    etag, last_modified = _dashboard_validators("citations", brand_profile_id, window, daily=True)
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    domains = _cached_query(
+        user_id, brand_profile_id, etag, _query_citation_share, brand_profile_id, start_day
+    )
+
+    response = jsonify(
         {
             "success": True,
             "window": window,
             "domains": domains,
         }
     )
+    return _with_validators(response, etag, last_modified)
+
+
+def _query_summary_sections(cursor, brand_profile_id, sections, start_day, metrics, history_limit):
+    payload = {}
+    if "stats" in sections:
+        payload["stats"] = _query_stats(cursor, brand_profile_id)
+    if "pillar_averages" in sections:
+        payload["pillar_averages"] = _query_pillar_averages(cursor, brand_profile_id)
+    if "history" in sections:
+        payload["history"] = _query_scan_history(cursor, brand_profile_id, history_limit, total=True)
+    if "citations" in sections:
+        payload["citations"] = _query_citation_share(cursor, brand_profile_id, start_day)
+    if "insights" in sections:
+        payload["insights"] = _query_insights(cursor, brand_profile_id)
+    if "trends" in sections:
+        payload["trends"] = _query_trend_series(cursor, brand_profile_id, metrics, start_day)
+    return payload
+
+
+SUMMARY_SECTIONS = ("stats", "pillar_averages", "history", "citations", "insights", "trends")
+DEFAULT_SUMMARY_TREND_METRICS = ("share_of_voice", "visibility_score")
+
+
+@dashboard_bp.route("/api/dashboard/summary/<int:user_id>", methods=["GET"])
+def get_dashboard_summary(user_id):
+    """
+    Everything the dashboard overview needs in one round trip and one connection.
+    Query params:
+    - include: comma-separated subset of SUMMARY_SECTIONS (default: all)
+    - window: 7d|14d|30d|60d|90d for trends and citations (default: 30d)
+    - metrics: comma-separated trend metric keys (default: share_of_voice,visibility_score)
+    - history_limit: recent scans to return (default: SCAN_HISTORY_PAGE_SIZE)
+    """
+    session_user_id, err = _require_user()
+    if err:
+        return err
+    if int(session_user_id) != int(user_id):
+        return _error("Forbidden", "forbidden", 403)
+
+    include_arg = (request.args.get("include") or "").strip()
+    sections = [part.strip() for part in include_arg.split(",") if part.strip()] or list(
+        SUMMARY_SECTIONS
+    )
+    unknown = [section for section in sections if section not in SUMMARY_SECTIONS]
+    if unknown:
+        return _error(f"Unknown include section: {', '.join(unknown)}", "validation_error", 400)
+    sections = [section for section in SUMMARY_SECTIONS if section in sections]
+    window = request.args.get("window") or "30d"
+    start_day = _window_start_day(_parse_window_days(window))
+    metrics = [
+        part.strip() for part in (request.args.get("metrics") or "").split(",") if part.strip()
+    ] or list(DEFAULT_SUMMARY_TREND_METRICS)
+    try:
+        history_limit = int(request.args.get("history_limit") or SCAN_HISTORY_PAGE_SIZE)
+    except ValueError:
+        return _error("Invalid history_limit", "validation_error", 400)
+    history_limit = max(1, min(history_limit, SCAN_HISTORY_MAX_PAGE_SIZE))
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        brand_profile_id = _latest_brand_profile_id(user_id, cursor)
+        if not brand_profile_id:
+            return _error("No brand profile found for this user", "not_found", 404)
+
+        etag, last_modified = _dashboard_validators(
+            "summary",
+            brand_profile_id,
+            ",".join(sections),
+            window,
+            ",".join(metrics),
+            history_limit,
+            daily="trends" in sections or "citations" in sections,
+            cursor=cursor,
+        )
+        not_modified = _not_modified(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        sections_payload = _cached_query(
+            user_id,
+            brand_profile_id,
+            etag,
+            _query_summary_sections,
+            brand_profile_id,
+            sections,
+            start_day,
+            metrics,
+            history_limit,
+            cursor=cursor,
+        )
+    finally:
+        conn.close()
+
+    summary = {
+        "success": True,
+        "brand_profile_id": brand_profile_id,
+        "window": window,
+        **sections_payload,
+    }
+    return _with_validators(jsonify(summary), etag, last_modified)
 
 
 @dashboard_bp.route("/api/report/<int:scan_id>/pdf", methods=["GET"])
@@ -566,7 +920,7 @@ def export_report_pdf(scan_id):
     citation_rows = cursor.fetchall()
     conn.close()
 
-    report = json.loads(scan["raw_report_json"]) if scan["raw_report_json"] else {}
+    report = expand_report(decode_json(scan["raw_report_json"], {}))
     analysis = report.get("analysis", {}) if isinstance(report, dict) else {}
     scores = analysis.get("scores", {}) if isinstance(analysis, dict) else {}
     sentiment = analysis.get("sentiment", {}) if isinstance(analysis, dict) else {}
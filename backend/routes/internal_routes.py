@@ -0,0 +1,81 @@
+# internal_routes.py
+"""
+AnswerScope AI - Internal Routes
+Flask blueprint for operational stats (caches, pools, write-behind buffers).
+Returns JSON only. No HTML templates.
+"""
+
+import hmac
+import os
+
+from flask import Blueprint, jsonify, request, g
+from backend.modules.ai_engine import llm_cache_stats
+from backend.modules.analysis import search_cache_stats
+from backend.modules.browser_pool import browser_pool_stats
+from backend.modules.codec import storage_stats
+from backend.modules.database import connection_pool_stats
+from backend.modules.job_store import get_job_store
+from backend.routes.dashboard_routes import dashboard_cache_stats
+
+internal_bp = Blueprint("internal_bp", __name__)
+
+INTERNAL_ENDPOINTS_ENABLED = os.environ.get(
+    "INTERNAL_ENDPOINTS_ENABLED", "0"
+).strip().lower() in ("1", "true", "yes", "on")
+# Shared secret operators send in the X-Internal-Token header; unset keeps the routes closed.
+INTERNAL_API_TOKEN = os.environ.get("INTERNAL_API_TOKEN", "").strip()
+
+
+def _operator_request():
+    """
+    True only for requests carrying the configured operator token.
+    Tenant sessions are not enough: these stats span every tenant.
+    """
+    if not INTERNAL_ENDPOINTS_ENABLED or not INTERNAL_API_TOKEN:
+        return False
+    supplied = request.headers.get("X-Internal-Token", "")
+    return hmac.compare_digest(supplied.encode("utf-8"), INTERNAL_API_TOKEN.encode("utf-8"))
+
+
+def _error(message, code, status):
+    return (
+        jsonify(
+            {
+                "success": False,
+                "error": {
+                    "code": code,
+                    "message": message,
+                    "request_id": g.get("request_id"),
+                },
+            }
+        ),
+        status,
+    )
+
+
+@internal_bp.route("/api/internal/cache-stats", methods=["GET"])
+def get_cache_stats():
+    """
+    Hit/miss/eviction counters for this process's caches, plus connection pool,
+    job store and browser pool stats. Operators only (X-Internal-Token).
+    Query params:
+    - storage=1: also report stored JSON column sizes (scans whole tables)
+    """
+    # Unknown to anyone without the operator token, so the route is not discoverable.
+    if not _operator_request():
+        return _error("Not found", "not_found", 404)
+
+    payload = {
+        "success": True,
+        "caches": {
+            "dashboard": dashboard_cache_stats(),
+            "llm": llm_cache_stats(),
+            "search": search_cache_stats(),
+        },
+        "connection_pool": connection_pool_stats(),
+        "job_store": get_job_store().stats(),
+        "browser_pool": browser_pool_stats(),
+    }
+    if (request.args.get("storage") or "").lower() in ("1", "true", "yes"):
+        payload["storage"] = storage_stats()
+    return jsonify(payload)
@@ -88,6 +88,9 @@ export interface ScanHistoryItem {
 export interface ScanHistoryResponse {
   success: true;
   total_scans: number;
+  total_count?: number | null;
+  has_more?: boolean;
+  next_cursor?: string | null;
   scans: ScanHistoryItem[];
 }
 
@@ -0,0 +1,41 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+import pytest
+
+# Importing backend.modules.database opens (and by default migrates) DB_PATH, so the
+# test database is chosen before any backend import and the real one is never touched.
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="answerscope-tests-")
+os.environ["SQLITE_DB_PATH"] = os.path.join(_TEST_DB_DIR, "database.db")
+os.environ["SQLITE_AUTO_MIGRATE"] = "0"
+
+# Tests import the app the same way app.py does: `backend.modules...` from the repo root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def test_database():
+    """Migrated throwaway database behind get_db_connection()."""
+    from backend.modules import database
+
+    database.init_db()
+    yield database.DB_PATH
+    database._POOL.close_all()
+    shutil.rmtree(_TEST_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def migrated_db():
+    """In-memory database with every schema migration applied."""
+    from backend.modules.database import MIGRATIONS
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    for _, _, apply in MIGRATIONS:
+        apply(conn)
+    conn.commit()
+    yield conn
+    conn.close()
@@ -0,0 +1,46 @@
+"""
+BrowserPool.run must not block forever on a stuck coroutine.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.modules.browser_pool import BrowserPool
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Loop thread only; no Chromium is launched.
+    pool = BrowserPool(size=1, run_timeout_sec=0.2)
+    pool._loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=pool._run_loop, daemon=True)
+    thread.start()
+    monkeypatch.setattr(pool, "_ensure_started", lambda: None)
+    yield pool
+    pool._loop.call_soon_threadsafe(pool._loop.stop)
+    thread.join(timeout=5)
+
+
+def test_run_returns_result(pool):
+    async def quick(value):
+        return value * 2
+
+    assert pool.run(quick, 21) == 42
+
+
+def test_run_times_out_and_cancels(pool):
+    cancelled = threading.Event()
+
+    async def stuck():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError, match="stuck"):
+        pool.run(stuck)
+    assert cancelled.wait(timeout=2)
+    assert pool._stats["run_timeouts"] == 1
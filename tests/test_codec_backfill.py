@@ -0,0 +1,51 @@
+"""
+The codec backfill compresses legacy text rows once and does not re-read rows that
+stay text (below JSON_CODEC_MIN_BYTES) on later runs.
+"""
+
+import json
+
+from backend.modules import codec
+from backend.modules.database import get_db_connection
+
+
+def _insert_text_scan(raw_report_json):
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO scan_results (brand_profile_id, keyword, raw_report_json) VALUES (1, 'kw', ?)",
+            (raw_report_json,),
+        )
+        conn.commit()
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def _stored(scan_id):
+    conn = get_db_connection()
+    try:
+        return conn.execute(
+            "SELECT raw_report_json FROM scan_results WHERE id = ?", (scan_id,)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_backfill_skips_rows_that_stay_text(monkeypatch):
+    large = json.dumps({"analysis": {"notes": "x" * codec.JSON_CODEC_MIN_BYTES}})
+    small = json.dumps({"analysis": {}})
+    large_id = _insert_text_scan(large)
+    small_id = _insert_text_scan(small)
+
+    codec.backfill_encoded_columns(pause_sec=0)
+    assert codec.is_encoded(_stored(large_id))
+    assert codec.decode_text(_stored(large_id)) == large
+    assert _stored(small_id) == small
+
+    examined = []
+    original = codec.encode_text
+    monkeypatch.setattr(codec, "encode_text", lambda text: examined.append(text) or original(text))
+    assert codec.backfill_encoded_columns(pause_sec=0) == {"scan_results": 0, "analysis_jobs": 0}
+    assert examined == []
@@ -0,0 +1,80 @@
+"""
+Daily rollups, whether folded in per scan or rebuilt from scratch, must equal
+the aggregates computed directly from scan_metrics and scan_citations.
+"""
+
+from backend.modules.database import apply_scan_rollups, rebuild_daily_rollups
+
+METRIC_AGGREGATE = """
+    SELECT brand_profile_id, metric_key, date(recorded_at) AS day,
+           SUM(metric_value) AS value_sum, COUNT(*) AS value_count
+    FROM scan_metrics GROUP BY brand_profile_id, metric_key, date(recorded_at)
+"""
+CITATION_AGGREGATE = """
+    SELECT brand_profile_id, date(recorded_at) AS day,
+           COALESCE(citation_domain, '') AS citation_domain, COUNT(*) AS mentions
+    FROM scan_citations GROUP BY brand_profile_id, date(recorded_at), COALESCE(citation_domain, '')
+"""
+
+
+def _rows(conn, sql):
+    return sorted(tuple(row) for row in conn.execute(sql).fetchall())
+
+
+def _metric_rollups(conn):
+    return _rows(
+        conn,
+        "SELECT brand_profile_id, metric_key, day, value_sum, value_count FROM metric_daily_rollups",
+    )
+
+
+def _citation_rollups(conn):
+    return _rows(
+        conn, "SELECT brand_profile_id, day, citation_domain, mentions FROM citation_daily_rollups"
+    )
+
+
+def _save_scans(conn, count=60):
+    """Insert scans the way save_scan_result does: raw rows, then per-scan rollups."""
+    cursor = conn.cursor()
+    for scan_id in range(1, count + 1):
+        brand_id = 1 + scan_id % 3
+        # Several scans per day, crossing midnight, plus NULL citation domains.
+        stamp = f"2026-03-{1 + scan_id // 8:02d} {(scan_id * 5) % 24:02d}:15:00"
+        cursor.execute(
+            "INSERT INTO scan_results (id, brand_profile_id, keyword, timestamp) VALUES (?, ?, ?, ?)",
+            (scan_id, brand_id, "kw", stamp),
+        )
+        for metric, value in (("visibility_score", scan_id % 100), ("trust_score", 0.5 * scan_id)):
+            cursor.execute(
+                "INSERT INTO scan_metrics (scan_id, brand_profile_id, keyword, metric_key, "
+                "metric_value, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (scan_id, brand_id, "kw", metric, value, stamp),
+            )
+        for domain in (f"site{scan_id % 4}.example", None, "site0.example"):
+            cursor.execute(
+                "INSERT INTO scan_citations (scan_id, brand_profile_id, keyword, citation_domain, "
+                "recorded_at) VALUES (?, ?, ?, ?, ?)",
+                (scan_id, brand_id, "kw", domain, stamp),
+            )
+        apply_scan_rollups(cursor, scan_id)
+    conn.commit()
+
+
+def test_incremental_rollups_match_aggregates(migrated_db):
+    _save_scans(migrated_db)
+    assert _metric_rollups(migrated_db) == _rows(migrated_db, METRIC_AGGREGATE)
+    assert _citation_rollups(migrated_db) == _rows(migrated_db, CITATION_AGGREGATE)
+
+
+def test_rebuilt_rollups_match_aggregates(migrated_db):
+    _save_scans(migrated_db)
+    incremental = (_metric_rollups(migrated_db), _citation_rollups(migrated_db))
+    # Drift the tables first so the rebuild has to correct them.
+    migrated_db.execute("UPDATE metric_daily_rollups SET value_sum = value_sum + 1")
+    migrated_db.execute("DELETE FROM citation_daily_rollups WHERE brand_profile_id = 2")
+    rebuild_daily_rollups(migrated_db)
+    migrated_db.commit()
+    assert _metric_rollups(migrated_db) == _rows(migrated_db, METRIC_AGGREGATE)
+    assert _citation_rollups(migrated_db) == _rows(migrated_db, CITATION_AGGREGATE)
+    assert (_metric_rollups(migrated_db), _citation_rollups(migrated_db)) == incremental
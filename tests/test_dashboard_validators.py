@@ -0,0 +1,53 @@
+"""
+Conditional GET on dashboard endpoints: the ETag decides, and a one-second
+If-Modified-Since never masks a write from the same second.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, Response
+from werkzeug.http import http_date
+
+from backend.routes.dashboard_routes import _not_modified, _with_validators
+
+app = Flask(__name__)
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _check(headers, etag, last_modified):
+    with app.test_request_context(headers=headers):
+        return _not_modified(etag, last_modified)
+
+
+def test_etag_match_is_not_modified():
+    response = _check({"If-None-Match": 'W/"abc"'}, "abc", _now() - timedelta(minutes=5))
+    assert response is not None and response.status_code == 304
+
+
+def test_etag_mismatch_wins_over_if_modified_since():
+    earlier = _now() - timedelta(minutes=5)
+    headers = {"If-None-Match": 'W/"old"', "If-Modified-Since": http_date(_now())}
+    assert _check(headers, "new", earlier) is None
+
+
+def test_if_modified_since_used_without_etag():
+    earlier = _now() - timedelta(minutes=5)
+    response = _check({"If-Modified-Since": http_date(earlier)}, "abc", earlier)
+    assert response is not None and response.status_code == 304
+
+
+def test_same_second_write_counts_as_modified():
+    now = _now()
+    assert _check({"If-Modified-Since": http_date(now)}, "abc", now) is None
+
+
+def test_current_second_stamp_not_sent():
+    with app.test_request_context():
+        fresh = _with_validators(Response(), "abc", _now())
+        settled = _with_validators(Response(), "abc", _now() - timedelta(seconds=2))
+    assert "Last-Modified" not in fresh.headers
+    assert "Last-Modified" in settled.headers
+    assert fresh.headers["ETag"] == 'W/"abc"'
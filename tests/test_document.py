@@ -0,0 +1,53 @@
+"""
+ParsedDocument must tolerate input lxml cannot turn into a tree.
+"""
+
+import pytest
+from lxml import etree
+
+from backend.modules.document import parse_document
+
+UNPARSEABLE = [
+    "",
+    "   ",
+    "<?xml version='1.0' encoding='utf-8'?>",
+    "<?xml version='1.0' encoding='utf-8'?>   ",
+    "<!-- only a comment -->",
+]
+
+
+@pytest.mark.parametrize("raw_html", UNPARSEABLE)
+def test_unparseable_html_yields_empty_views(raw_html):
+    document = parse_document(raw_html)
+    assert document.tree is None
+    assert document.text_blocks == []
+    assert document.full_text() == ""
+
+
+def test_xml_declaration_with_body_still_parses():
+    document = parse_document(
+        "<?xml version='1.0' encoding='utf-8'?><html><body><h1>Title here</h1></body></html>"
+    )
+    assert document.tree is not None
+    assert "Title here" in document.text_blocks
+
+
+def test_boilerplate_skipped_without_touching_tree():
+    raw_html = (
+        "<html><head><title>Guide</title></head><body>"
+        "<nav><p>Navigation paragraph that is long enough to count</p></nav>"
+        "<div class='content'><h1>Main <span class='cookie'>x</span>heading</h1>"
+        "<p>Intro<aside>ad</aside> text that continues past the aside block.</p></div>"
+        "<footer>Footer</footer></body></html>"
+    )
+    document = parse_document(raw_html)
+    before = etree.tostring(document.tree)
+    assert document.text_blocks == [
+        "Guide",
+        "Main heading",
+        "Intro text that continues past the aside block.",
+    ]
+    assert document.full_text() == (
+        "Guide\nMain heading\nIntro text that continues past the aside block."
+    )
+    assert etree.tostring(document.tree) == before
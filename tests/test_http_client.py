@@ -0,0 +1,77 @@
+"""
+http_get retry policy: no blind ReadTimeout retries, and no retry past the caller's deadline.
+"""
+
+import time
+
+import pytest
+import requests
+
+from backend.modules import http_client
+
+
+class _FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def get(self, url, params=None, timeout=None):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        return response
+
+
+@pytest.fixture
+def session(monkeypatch):
+    def install(*outcomes):
+        fake = _FakeSession(outcomes)
+        monkeypatch.setattr(http_client, "get_http_session", lambda: fake)
+        monkeypatch.setattr(http_client, "_backoff_delay", lambda attempt, response=None: 0.0)
+        return fake
+
+    return install
+
+
+def test_read_timeout_not_retried_by_default(session):
+    fake = session(requests.ReadTimeout(), 200)
+    with pytest.raises(requests.ReadTimeout):
+        http_client.http_get("https://example.com/", max_retries=2)
+    assert len(fake.timeouts) == 1
+
+
+def test_read_timeout_retried_when_allowed(session):
+    fake = session(requests.ReadTimeout(), 200)
+    response = http_client.http_get("https://example.com/", retry_read_timeout=True)
+    assert response.status_code == 200
+    assert len(fake.timeouts) == 2
+
+
+def test_connect_error_retried(session):
+    fake = session(requests.ConnectionError(), 200)
+    assert http_client.http_get("https://example.com/").status_code == 200
+    assert len(fake.timeouts) == 2
+
+
+def test_attempt_timeout_clipped_to_deadline(session):
+    fake = session(200)
+    http_client.http_get("https://example.com/", timeout=30, deadline=time.perf_counter() + 5)
+    assert fake.timeouts[0] <= 5
+
+
+def test_no_retry_once_deadline_is_too_close(session):
+    fake = session(503, 200)
+    deadline = time.perf_counter() + http_client.HTTP_MIN_ATTEMPT_SEC / 2
+    response = http_client.http_get("https://example.com/", deadline=deadline)
+    assert response.status_code == 503
+    assert len(fake.timeouts) == 1
+
+
+def test_expired_deadline_raises_without_request(session):
+    fake = session(200)
+    with pytest.raises(requests.Timeout):
+        http_client.http_get("https://example.com/", deadline=time.perf_counter() - 1)
+    assert fake.timeouts == []
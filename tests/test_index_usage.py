@@ -0,0 +1,61 @@
+"""
+Every hot dashboard/job query must be planned on the index it was tuned for.
+"""
+
+import pytest
+
+from backend.modules.database import HOT_QUERIES, MANAGED_INDEXES, check_index_usage
+
+
+def _seed(conn, brands=5, scans_per_brand=40):
+    scan_id = 0
+    for brand_id in range(1, brands + 1):
+        conn.execute(
+            "INSERT INTO brand_profiles (id, user_id, brand_name, website_url) VALUES (?, ?, ?, ?)",
+            (brand_id, brand_id, f"Brand {brand_id}", f"https://brand{brand_id}.example"),
+        )
+        for n in range(scans_per_brand):
+            scan_id += 1
+            stamp = f"2026-01-{1 + n % 28:02d} 12:{n % 60:02d}:00"
+            conn.execute(
+                "INSERT INTO scan_results (id, brand_profile_id, keyword, timestamp) "
+                "VALUES (?, ?, ?, ?)",
+                (scan_id, brand_id, f"kw{n}", stamp),
+            )
+            for metric in ("visibility_score", "trust_score", "las_score"):
+                conn.execute(
+                    "INSERT INTO scan_metrics (scan_id, brand_profile_id, keyword, metric_key, "
+                    "metric_value, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (scan_id, brand_id, f"kw{n}", metric, n % 100, stamp),
+                )
+            conn.execute(
+                "INSERT INTO scan_citations (scan_id, brand_profile_id, keyword, citation_domain, "
+                "recorded_at) VALUES (?, ?, ?, ?, ?)",
+                (scan_id, brand_id, f"kw{n}", f"site{n % 7}.example", stamp),
+            )
+            conn.execute(
+                "INSERT INTO scan_run_events (job_id, scan_id, event_type, stage_label) "
+                "VALUES (?, ?, ?, ?)",
+                (f"job-{scan_id}", scan_id, "completed", "Completed"),
+            )
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def test_managed_indexes_exist(migrated_db):
+    names = {
+        row[0]
+        for row in migrated_db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    for name, _, _ in MANAGED_INDEXES:
+        assert name in names
+
+
+@pytest.mark.parametrize("seeded", [False, True])
+def test_hot_queries_use_their_index(migrated_db, seeded):
+    if seeded:
+        _seed(migrated_db)
+    report = check_index_usage(migrated_db)
+    assert set(report) == set(HOT_QUERIES)
+    for name, entry in report.items():
+        assert entry["uses_index"], f"{name} planned as {entry['plan']}, expected {entry['index']}"
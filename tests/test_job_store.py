@@ -0,0 +1,55 @@
+"""
+Terminal job states must not be dropped when a flush fails.
+"""
+
+import pytest
+
+from backend.modules import job_store
+
+
+class _BrokenConnection:
+    def cursor(self):
+        raise RuntimeError("database is locked")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(job_store, "JOB_STORE_TERMINAL_FLUSH_BACKOFF_SEC", 0.0)
+    store = job_store.JobStore(flush_interval_sec=0)
+    store._jobs["job-1"] = {"job_id": "job-1", "status": "running"}
+    return store
+
+
+def test_terminal_update_retried_until_flush_succeeds(store, monkeypatch):
+    calls = []
+
+    def flaky_flush():
+        calls.append(1)
+        return len(calls) >= 3
+
+    monkeypatch.setattr(store, "flush", flaky_flush)
+    store.update("job-1", status="completed", progress=100)
+    assert len(calls) == 3
+
+
+def test_failed_terminal_flush_keeps_job_dirty(store, monkeypatch):
+    monkeypatch.setattr(job_store, "get_db_connection", lambda: _BrokenConnection())
+    store.update("job-1", status="failed", error="boom")
+    assert store._dirty["job-1"]["status"] == "failed"
+    assert store.get("job-1")["status"] == "failed"
+    assert store.stats()["flush_errors"] == job_store.JOB_STORE_TERMINAL_FLUSH_RETRIES + 1
+
+
+def test_connection_error_requeues_events(store, monkeypatch):
+    def no_connection():
+        raise RuntimeError("unable to open database file")
+
+    monkeypatch.setattr(job_store, "get_db_connection", no_connection)
+    store.append_event("job-1", "completed", "Completed")
+    assert len(store._events) == 1
@@ -0,0 +1,91 @@
+"""
+Scans saved before scan_summaries existed are summarized by the startup backfill;
+dashboard reads never write them.
+"""
+
+import pytest
+
+from backend.modules.codec import encode_json
+from backend.modules.database import get_db_connection
+from backend.modules.summaries import backfill_scan_summaries
+from backend.routes.dashboard_routes import _query_insights
+
+REPORT = {"analysis": {"action_plan": [{"title": "a"}, {"title": "b"}], "diagnostics": ["d"]}}
+
+
+@pytest.fixture
+def legacy_scan():
+    """A brand whose only scan has artifact rows but no scan_summaries row."""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO brand_profiles (user_id, brand_name, website_url) VALUES (1, 'B', 'https://b.example')"
+        )
+        brand_id = cursor.lastrowid
+        cursor.execute(
+            "INSERT INTO scan_results (brand_profile_id, keyword, raw_report_json) VALUES (?, 'kw', ?)",
+            (brand_id, encode_json(REPORT)),
+        )
+        scan_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO scan_metrics (scan_id, brand_profile_id, keyword, metric_key, metric_value, "
+            "competitor_domain) VALUES (?, ?, 'kw', ?, 1, ?)",
+            [(scan_id, brand_id, "visibility_score", None), (scan_id, brand_id, "share", "c.example")],
+        )
+        cursor.execute(
+            "INSERT INTO scan_citations (scan_id, brand_profile_id, keyword, citation_domain) "
+            "VALUES (?, ?, 'kw', 'x.example')",
+            (scan_id, brand_id),
+        )
+        cursor.execute(
+            "INSERT INTO scan_run_events (job_id, scan_id, event_type, stage_label) "
+            "VALUES ('job', ?, 'completed', 'Completed')",
+            (scan_id,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return brand_id, scan_id
+
+
+def _summary_row(scan_id):
+    conn = get_db_connection()
+    try:
+        row = conn.execute("SELECT * FROM scan_summaries WHERE scan_id = ?", (scan_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def test_insights_read_does_not_store_summary(legacy_scan):
+    brand_id, scan_id = legacy_scan
+    conn = get_db_connection()
+    try:
+        insights = _query_insights(conn.cursor(), brand_id)
+        assert not conn.in_transaction
+    finally:
+        conn.close()
+    assert insights["stored_records"]["scan_metrics"] == 2
+    assert insights["stored_records"]["scan_run_events"] == 1
+    assert insights["analysis_artifacts"]["action_plan_items"] == 2
+    assert _summary_row(scan_id) is None
+
+
+def test_backfill_writes_missing_summaries_once(legacy_scan):
+    _, scan_id = legacy_scan
+    assert backfill_scan_summaries(batch_size=1, pause_sec=0) >= 1
+    row = _summary_row(scan_id)
+    assert row["scan_metrics"] == 2
+    assert row["scan_citations"] == 1
+    assert row["scan_run_events"] == 1
+    assert row["action_plan_items"] == 2
+    assert row["diagnostics_items"] == 1
+    assert row["raw_report_present"] == 1
+    assert row["breakdown_present"] == 1
+    assert backfill_scan_summaries(pause_sec=0) == 0
+
+
+def test_artifact_counts_column_is_dropped(migrated_db):
+    columns = {row[1] for row in migrated_db.execute("PRAGMA table_info(scan_results)")}
+    assert "artifact_counts_json" not in columns
@@ -0,0 +1,36 @@
+"""
+Only search contexts SerpApi actually answered are cached.
+"""
+
+import pytest
+
+from backend.modules import analysis
+
+
+@pytest.mark.parametrize(
+    "source_type, cached",
+    [
+        ("ai_overview", True),
+        ("organic", True),
+        ("none", False),
+        ("synthetic", False),
+        ("error", False),
+        ("timeout", False),
+    ],
+)
+def test_search_context_cached_by_source_type(monkeypatch, source_type, cached):
+    calls = []
+
+    def fake_fetch(keyword, **kwargs):
+        calls.append(keyword)
+        return {"text": "t", "source_type": source_type, "citations": [], "raw": {}}
+
+    monkeypatch.setattr(analysis, "_fetch_google_ai_overview", fake_fetch)
+    analysis.SEARCH_CACHE.clear()
+    keyword = f"cache-{source_type}"
+
+    analysis.fetch_google_ai_overview(keyword)
+    second = analysis.fetch_google_ai_overview(keyword)
+
+    assert len(calls) == (1 if cached else 2)
+    assert second.get("cache_hit", False) is cached
@@ -0,0 +1,72 @@
+"""
+Trust-signal counts and scores pinned to what the original per-signal
+HTMLParser/regex passes produced on the same pages.
+"""
+
+import pytest
+
+from backend.modules.scoring import (
+    TrustSignalScanner,
+    calculate_trust_score,
+    extract_trust_signals,
+)
+
+# name -> (html, has_https_reference, meta_count, json_ld_count, trust score)
+PAGES = {
+    "plain": (
+        '<html><head><meta charset="utf-8"><meta name="description" content="x">'
+        '<script type="application/ld+json">{}</script></head>'
+        '<body><a href="https://example.com/">x</a></body></html>',
+        True, 2, 1, 32,
+    ),
+    "meta_in_title": (
+        "<html><head><title><meta name='a'></title></head><body></body></html>",
+        False, 1, 0, 2,
+    ),
+    "meta_in_textarea": (
+        "<html><body><textarea><meta name='a'><meta name='b'></textarea></body></html>",
+        False, 2, 0, 4,
+    ),
+    "meta_in_iframe": (
+        "<html><body><iframe><meta name='a'></iframe></body></html>",
+        False, 1, 0, 2,
+    ),
+    "meta_in_plaintext": (
+        "<html><body><plaintext><meta name='a'><meta name='b'></body></html>",
+        False, 2, 0, 4,
+    ),
+    "padded_ld_type": (
+        '<html><head><script type=" application/ld+json">{}</script></head></html>',
+        False, 0, 0, 0,
+    ),
+    "upper_ld_type": (
+        '<html><head><script type="APPLICATION/LD+JSON">{}</script></head></html>',
+        False, 0, 1, 8,
+    ),
+    "empty": ("", False, 0, 0, 0),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_counts_match_original_parsers(name):
+    html, has_https, meta_count, json_ld_count, _ = PAGES[name]
+    signals = extract_trust_signals(html)
+    assert signals["has_https_reference"] is has_https
+    assert signals["meta_count"] == meta_count
+    assert signals["json_ld_count"] == json_ld_count
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_score_matches_original(name):
+    html, *_, score = PAGES[name]
+    assert calculate_trust_score(html, signals=extract_trust_signals(html)) == score
+    assert calculate_trust_score(html) == score
+
+
+def test_chunked_feed_matches_whole_page():
+    html = PAGES["plain"][0]
+    scanner = TrustSignalScanner()
+    for start in range(0, len(html), 7):
+        scanner.feed(html[start:start + 7])
+    assert scanner.signals() == extract_trust_signals(html)
+